@@ -3,15 +3,29 @@ from __future__ import annotations
 from dataclasses import dataclass
 import logging
 from homeassistant import config_entries, core
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
-    CONF_IP_ADDRESS
+    CONF_IP_ADDRESS,
+    CONF_PORT,
+    CONF_UNIT_ID,
+    CONF_PIPELINED,
+    CONF_MAX_IN_FLIGHT,
+    CONF_SAMPLING,
+    CONF_SAMPLE_WINDOW,
+    DEFAULT_PORT,
+    DEFAULT_UNIT_ID,
+    DEFAULT_SAMPLE_WINDOW,
+    STORAGE_VERSION
 )
 
 from .coordinator import (
     InverterCoordinator
 )
+from .pipeline import DEFAULT_MAX_IN_FLIGHT
+from .websocket_api import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +41,7 @@ class KostalPlenticoreModbusData:
 
 async def async_setup(hass: core.HomeAssistant, config: dict):
     hass.data.setdefault(DOMAIN, {})
+    async_setup_websocket(hass)
     return True
 
 async def async_setup_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry):
@@ -34,21 +49,49 @@ async def async_setup_entry(hass: core.HomeAssistant, entry: config_entries.Conf
     _LOGGER.info(f"Setting up {DOMAIN} with {entry.data}")
 
     ip_address = entry.data[CONF_IP_ADDRESS]
-    inverter_coordinator = InverterCoordinator(hass, entry, ip_address)
+    inverter_coordinator = InverterCoordinator(
+        hass,
+        entry,
+        ip_address,
+        pipelined=entry.data.get(CONF_PIPELINED, False),
+        max_in_flight=entry.data.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+        port=entry.data.get(CONF_PORT, DEFAULT_PORT),
+        unit_id=entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+        sample_window=entry.data.get(CONF_SAMPLE_WINDOW, DEFAULT_SAMPLE_WINDOW) if entry.data.get(CONF_SAMPLING, False) else None,
+    )
 
-    await inverter_coordinator.async_config_entry_first_refresh()
+    restored = await inverter_coordinator.async_load_snapshot()
     entry.runtime_data = KostalPlenticoreModbusData(
         inverter_coordinator = inverter_coordinator
     )
 
+    # The entities register their registers while being added, so the first poll reads the complete read plan
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        # With a snapshot of the last run startup does not wait for the inverter
+        inverter_coordinator.async_apply_snapshot()
+        entry.async_create_background_task(hass, inverter_coordinator.async_refresh(), f"{DOMAIN} first poll")
+        return True
+
+    try:
+        await inverter_coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        # The retry sets the platforms up again
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        raise
+
     return True
 
 async def async_unload_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
+        await entry.runtime_data.inverter_coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+async def async_remove_entry(hass: core.HomeAssistant, entry: config_entries.ConfigEntry) -> None:
+    """Remove the register snapshot of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
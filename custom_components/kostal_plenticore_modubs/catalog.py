@@ -0,0 +1,95 @@
+"""Typed, address indexed catalog of the documented registers."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+from typing import NamedTuple
+
+from .decoder import DATATYPE_REGISTERS
+from .KOSTAL_Register import KOSTAL_MODBUS_REGISTERS
+
+
+class CatalogRegister(NamedTuple):
+    """One documented register (immutable, no per-instance dict)."""
+
+    address: int
+    description: str
+    unit: str | None
+    datatype: str
+    count: int
+    access: str
+
+    @property
+    def readable(self) -> bool:
+        return "R" in self.access
+
+    @property
+    def writable(self) -> bool:
+        return "W" in self.access
+
+
+def _datatype(info: Mapping) -> str | None:
+    """Datatype of a register map entry, None if it cannot be decoded."""
+    datatype = info["datatype"]
+    if datatype is None:
+        # Scale factors are documented without datatype, they are SunSpec sunssf (int16)
+        return "S16" if "scale factor" in info["description"].lower() and info["registers"] == 1 else None
+    if datatype != "String" and datatype not in DATATYPE_REGISTERS:
+        return None
+    return datatype
+
+
+class RegisterCatalog:
+    """Registers sorted by address, with lookup and range queries."""
+
+    def __init__(self, registers: Mapping[int, Mapping]):
+        records = []
+        for address, info in registers.items():
+            datatype = _datatype(info)
+            if datatype is None:
+                # Reserved
+                continue
+            records.append(CatalogRegister(
+                address,
+                info["description"],
+                info["unit"],
+                datatype,
+                info["registers"],
+                info["access"],
+            ))
+        records.sort()
+        self._records = tuple(records)
+        self._addresses = tuple(record.address for record in records)
+        self._max_count = max((record.count for record in records), default=1)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[CatalogRegister]:
+        return iter(self._records)
+
+    def __contains__(self, address: int) -> bool:
+        index = bisect_left(self._addresses, address)
+        return index < len(self._addresses) and self._addresses[index] == address
+
+    def __getitem__(self, address: int) -> CatalogRegister:
+        index = bisect_left(self._addresses, address)
+        if index < len(self._addresses) and self._addresses[index] == address:
+            return self._records[index]
+        raise KeyError(address)
+
+    def get(self, address: int, default=None) -> CatalogRegister | None:
+        try:
+            return self[address]
+        except KeyError:
+            return default
+
+    def in_range(self, start: int, end: int) -> tuple[CatalogRegister, ...]:
+        """Registers overlapping the addresses start..end-1."""
+        # Registers more than _max_count before start cannot reach it
+        first = bisect_left(self._addresses, start - self._max_count)
+        last = bisect_left(self._addresses, end)
+        return tuple(record for record in self._records[first:last] if record.address + record.count > start)
+
+
+CATALOG = RegisterCatalog(KOSTAL_MODBUS_REGISTERS)
@@ -0,0 +1,79 @@
+"""Circuit breaker for polling an unreachable inverter."""
+from __future__ import annotations
+
+import random
+
+# Consecutive failed polls before the circuit opens
+FAILURE_THRESHOLD = 3
+# Pause before probing an open circuit (seconds), doubled after every failed probe
+BACKOFF_MIN = 10.0
+BACKOFF_MAX = 600.0
+# Relative random variation of the pause
+BACKOFF_JITTER = 0.2
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops polling an inverter that does not answer.
+
+    While the circuit is closed every poll goes out. After `threshold`
+    consecutive failures it opens and polls are skipped without touching
+    the network until the backoff delay has passed. Then the circuit is
+    half open and a single probe is allowed: success closes the circuit,
+    failure opens it again with twice the delay, up to `backoff_max`. The
+    delay varies by +-`jitter` so that several instances do not probe in
+    lockstep.
+    """
+
+    def __init__(
+        self,
+        threshold: int = FAILURE_THRESHOLD,
+        backoff_min: float = BACKOFF_MIN,
+        backoff_max: float = BACKOFF_MAX,
+        jitter: float = BACKOFF_JITTER,
+    ):
+        self._threshold = max(1, threshold)
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self._random = random.Random()
+        self._delay = 0.0
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.opened = 0
+
+    def allow(self, now: float) -> str:
+        """State for a poll at monotonic time now, moves an expired open circuit to half open."""
+        if self.state == STATE_OPEN and now >= self.retry_at:
+            self.state = STATE_HALF_OPEN
+        return self.state
+
+    def record_success(self) -> bool:
+        """Account for an answered poll. Returns True if this closed the circuit."""
+        recovered = self.state != STATE_CLOSED
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._delay = 0.0
+        return recovered
+
+    def record_failure(self, now: float) -> bool:
+        """Account for a failed poll. Returns True if this opened a closed circuit.
+
+        A failed probe opens the circuit again with a longer delay, but
+        returns False: the circuit was not closed in between.
+        """
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < self._threshold:
+            return False
+        opened = self.state == STATE_CLOSED
+
+        self._delay = min(max(2 * self._delay, self._backoff_min), self._backoff_max)
+        delay = self._delay * self._random.uniform(1 - self._jitter, 1 + self._jitter)
+        self.state = STATE_OPEN
+        self.retry_at = now + delay
+        self.opened += 1
+        return opened
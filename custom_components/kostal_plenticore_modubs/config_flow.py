@@ -2,7 +2,21 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, NAME, CONF_IP_ADDRESS
+from .const import (
+    DOMAIN,
+    NAME,
+    CONF_IP_ADDRESS,
+    CONF_PORT,
+    CONF_UNIT_ID,
+    CONF_PIPELINED,
+    CONF_MAX_IN_FLIGHT,
+    CONF_SAMPLING,
+    CONF_SAMPLE_WINDOW,
+    DEFAULT_PORT,
+    DEFAULT_UNIT_ID,
+    DEFAULT_SAMPLE_WINDOW,
+)
+from .pipeline import DEFAULT_MAX_IN_FLIGHT
 
 class HaKostalPlenticoreModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Kostal Plenticore Modbus."""
@@ -10,11 +24,20 @@ class HaKostalPlenticoreModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAI
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         if user_input is not None:
-            return self.async_create_entry(title=NAME, data=user_input)
+            title = NAME
+            if user_input.get(CONF_UNIT_ID, DEFAULT_UNIT_ID) != DEFAULT_UNIT_ID:
+                title = f"{NAME} (unit {user_input[CONF_UNIT_ID]})"
+            return self.async_create_entry(title=title, data=user_input)
 
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({
                 vol.Required(CONF_IP_ADDRESS, default="192.168.1.23"): cv.string,
+                vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                vol.Optional(CONF_UNIT_ID, default=DEFAULT_UNIT_ID): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+                vol.Optional(CONF_PIPELINED, default=False): cv.boolean,
+                vol.Optional(CONF_MAX_IN_FLIGHT, default=DEFAULT_MAX_IN_FLIGHT): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                vol.Optional(CONF_SAMPLING, default=False): cv.boolean,
+                vol.Optional(CONF_SAMPLE_WINDOW, default=DEFAULT_SAMPLE_WINDOW): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
             }),
         )
@@ -0,0 +1,243 @@
+"""Persistent Modbus TCP connection to a Kostal Plenticore inverter."""
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOException
+
+from .const import DATA_CONNECTIONS, DEFAULT_PORT, DEFAULT_UNIT_ID
+from .metrics import RollingWindow
+from .pipeline import DEFAULT_MAX_IN_FLIGHT, PIPELINE_SUPPORTED, AdaptivePacer, ModbusTcpPipeline
+
+_LOGGER = logging.getLogger(__name__)
+
+# Set during connects expected to fail, pymodbus' warnings about them are dropped
+_QUIET_CONNECT: ContextVar[bool] = ContextVar("quiet_connect", default=False)
+
+
+class _QuietConnectFilter(logging.Filter):
+    """Drops pymodbus warnings logged by quiet connects of the current task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.ERROR or not _QUIET_CONNECT.get()
+
+
+# pymodbus logs everything through this logger
+logging.getLogger("pymodbus.logging").addFilter(_QuietConnectFilter())
+
+
+class ModbusResponseError(ModbusException):
+    """The inverter answered a request with a Modbus exception response."""
+
+    def __init__(self, message, exception_code=None):
+        super().__init__(message)
+        self.exception_code = exception_code
+
+
+class KostalModbusConnection:
+    """Long-lived Modbus TCP client shared by reads and writes.
+
+    The client is connected lazily on first use and kept open between polls.
+    Transport errors drop the client, the next request reconnects. Backing
+    off from an unreachable inverter is left to the caller (CircuitBreaker).
+
+    In pipelined mode a ModbusTcpPipeline replaces the pymodbus client so
+    that concurrent requests share the socket instead of queueing.
+
+    Inverters behind one endpoint (a Modbus TCP gateway addressing them by
+    unit id) share one connection; requests take the unit id, and callers
+    serialize their transactions with `lock`.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, device_id=DEFAULT_UNIT_ID, pipelined=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self._host = host
+        self._port = port
+        self._device_id = device_id
+        if pipelined and not PIPELINE_SUPPORTED:
+            _LOGGER.warning("Pipelining needs pymodbus 3.11, reading %s:%s serially", host, port)
+            pipelined = False
+        self._pipelined = pipelined
+        self._client: AsyncModbusTcpClient | ModbusTcpPipeline | None = None
+        self.pacer = AdaptivePacer(max_in_flight if pipelined else 1)
+        self.lock = asyncio.Lock()
+        # Config entries sharing the connection
+        self.users: set[str] = set()
+
+        self.connects = 0
+        self.reuses = 0
+        self.connect_failures = 0
+        self.timeouts = 0
+        self.exception_responses = 0
+        self.latencies = RollingWindow()
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def pipelined(self) -> bool:
+        return self._pipelined
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None and self._client.connected
+
+    async def async_ensure_connected(self, quiet: bool = False) -> bool:
+        """Connect if necessary. Returns False if the inverter cannot be reached.
+
+        With quiet, pymodbus' warnings about a failed connect are dropped,
+        for probes of an inverter known to be unreachable.
+        """
+        if self.connected:
+            self.reuses += 1
+            return True
+
+        self._close_client()
+        if self._pipelined:
+            self._client = ModbusTcpPipeline(self._host, self._port, self.pacer)
+        else:
+            # Reconnects are driven by us, not by pymodbus' background task
+            self._client = AsyncModbusTcpClient(self._host, port=self._port, reconnect_delay=0)
+
+        token = _QUIET_CONNECT.set(quiet)
+        try:
+            connected = await self._client.connect()
+        finally:
+            _QUIET_CONNECT.reset(token)
+        if connected:
+            self.connects += 1
+            _LOGGER.debug("Connected to %s:%s", self._host, self._port)
+            return True
+
+        self.connect_failures += 1
+        self._close_client()
+        return False
+
+    async def async_read_holding_registers(self, address: int, count: int, device_id: int | None = None) -> list[int]:
+        """Read a block of holding registers (of the default unit without device_id)."""
+        if self._client is None:
+            raise ConnectionException("Not connected")
+        if not self._pipelined and (delay := self.pacer.delay) > 0:
+            # The pipeline spaces its requests itself
+            await asyncio.sleep(delay)
+        try:
+            started = time.monotonic()
+            result = await self._client.read_holding_registers(address, count=count, device_id=self._device_id if device_id is None else device_id)
+            elapsed = time.monotonic() - started
+            self.latencies.add(elapsed)
+            if not self._pipelined:
+                # The pipeline measures itself, excluding the wait for a free slot
+                self.pacer.record(elapsed)
+        except ModbusException as e:
+            if isinstance(e, ModbusIOException):
+                self.timeouts += 1
+            self._close_client()
+            raise
+
+        if result.isError():
+            self.exception_responses += 1
+            raise ModbusResponseError(
+                f"Error reading registers: addr={address} count={count}",
+                getattr(result, "exception_code", None),
+            )
+        return result.registers
+
+    async def async_write_registers(self, address: int, values: list[int], device_id: int | None = None) -> None:
+        """Write a block of holding registers (of the default unit without device_id)."""
+        if self._client is None:
+            raise ConnectionException("Not connected")
+        try:
+            result = await self._client.write_registers(address, values=values, device_id=self._device_id if device_id is None else device_id)
+        except ModbusException as e:
+            if isinstance(e, ModbusIOException):
+                self.timeouts += 1
+            self._close_client()
+            raise
+
+        if result.isError():
+            self.exception_responses += 1
+            raise ModbusResponseError(
+                f"Error writing registers: addr={address} count={len(values)}",
+                getattr(result, "exception_code", None),
+            )
+
+    async def async_read_blocks(self, blocks: list[tuple[int, int]], device_id: int | None = None) -> list[list[int] | ModbusResponseError]:
+        """Read several blocks, concurrently when pipelined.
+
+        Exception responses are returned in place of the block's registers,
+        transport errors are raised.
+        """
+        if self._pipelined:
+            results = await asyncio.gather(
+                *(self.async_read_holding_registers(address, count, device_id) for address, count in blocks),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(result, ModbusResponseError):
+                    raise result
+            return results
+
+        results = []
+        for address, count in blocks:
+            try:
+                results.append(await self.async_read_holding_registers(address, count, device_id))
+            except ModbusResponseError as e:
+                results.append(e)
+        return results
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        self._close_client()
+
+    def _close_client(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+@callback
+def async_get_shared_connection(
+    hass: HomeAssistant,
+    entry_id: str,
+    host: str,
+    port: int = DEFAULT_PORT,
+    pipelined: bool = False,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> KostalModbusConnection:
+    """Connection to host:port, shared by all config entries targeting it.
+
+    The first entry decides whether the connection is pipelined.
+    """
+    connections: dict[tuple[str, int], KostalModbusConnection] = hass.data.setdefault(DATA_CONNECTIONS, {})
+    connection = connections.get((host, port))
+    if connection is None:
+        connection = connections[(host, port)] = KostalModbusConnection(
+            host, port, pipelined=pipelined, max_in_flight=max_in_flight
+        )
+    elif connection.pipelined != pipelined:
+        _LOGGER.warning(
+            "Connection to %s:%s is shared and %s pipelined, ignoring the setting of this entry",
+            host, port, "is" if connection.pipelined else "is not",
+        )
+    connection.users.add(entry_id)
+    return connection
+
+
+async def async_release_shared_connection(hass: HomeAssistant, entry_id: str, connection: KostalModbusConnection) -> None:
+    """Stop using a shared connection, closes it when no entry uses it anymore."""
+    connection.users.discard(entry_id)
+    if connection.users:
+        return
+    connections = hass.data.get(DATA_CONNECTIONS, {})
+    if connections.get((connection.host, connection.port)) is connection:
+        del connections[(connection.host, connection.port)]
+    await connection.async_close()
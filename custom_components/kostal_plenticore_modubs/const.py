@@ -3,4 +3,63 @@ MANUFACTURER = "Kostal"
 MODEL = "Plenticore"
 NAME = "Kostal Plenticore Modbus"
 
-CONF_IP_ADDRESS = 'ip_address'
\ No newline at end of file
+CONF_IP_ADDRESS = 'ip_address'
+CONF_PORT = 'port'
+CONF_UNIT_ID = 'unit_id'
+CONF_PIPELINED = 'pipelined'
+CONF_MAX_IN_FLIGHT = 'max_in_flight'
+CONF_SAMPLING = 'sampling'
+CONF_SAMPLE_WINDOW = 'sample_window'
+
+DEFAULT_PORT = 1502
+DEFAULT_UNIT_ID = 71
+# Seconds of 1 s samples aggregated into one state
+DEFAULT_SAMPLE_WINDOW = 15
+
+# Register 5 ("MODBUS Byte Order"): 0 = little endian (CDAB), 1 = big endian (ABCD)
+BYTE_ORDER_ADDRESS = 5
+BYTE_ORDER_LITTLE = 0
+BYTE_ORDER_BIG = 1
+
+# hass.data key of the connections shared by the config entries, by (host, port)
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+
+# Static identity registers, read after every (re)connect but never polled: key: (address, count)
+IDENTITY_REGISTERS = {
+    "article_number": (6, 8),
+    "serial_number": (14, 8),
+    "mc_version": (38, 8),
+    "ioc_version": (46, 8),
+    "software_version": (58, 13),
+    "product_name": (768, 32),
+    "power_class": (800, 32),
+}
+
+# Poll tiers of the registers and their intervals in seconds
+POLL_TIER_SAMPLE = 'sample'  # aggregated per sample window
+POLL_TIER_FAST = 'fast'
+POLL_TIER_NORMAL = 'normal'
+POLL_TIER_SLOW = 'slow'
+POLL_TIER_ONCE = 'once'  # read after every (re)connect
+
+POLL_TIER_INTERVALS = {
+    POLL_TIER_SAMPLE: 1,
+    POLL_TIER_FAST: 2,
+    POLL_TIER_NORMAL: 15,
+    POLL_TIER_SLOW: 300,
+}
+
+# Inverter states (register 56) in which the PV registers are not polled
+INVERTER_IDLE_STATES = (
+    0,   # Off
+    10,  # Standby
+    15,  # Shutdown
+)
+# Minimal tick interval in seconds while the inverter is idle
+IDLE_POLL_INTERVAL = 30
+
+# Register snapshot persisted for a fast startup, saved at most every SNAPSHOT_SAVE_DELAY seconds
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 300
+# Seconds the restored values are shown while the inverter does not answer, unless the circuit opens first
+RESTORE_GRACE_PERIOD = 300
@@ -1,33 +1,98 @@
-"""Coordinators for willow."""
+"""Coordinator polling the Modbus registers of a Kostal Plenticore inverter."""
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Callable
 from datetime import timedelta
-from typing import Final
-from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
+from pymodbus.exceptions import ConnectionException, ModbusException
 import logging
+import sys
+import time
 
 import asyncio
 
-
-from homeassistant.helpers.entity import Entity
-from homeassistant.const import PERCENTAGE
-
 from homeassistant.core import callback
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .const import DOMAIN, CONF_IP_ADDRESS, NAME, MANUFACTURER, MODEL
+from .const import (
+    DOMAIN,
+    NAME,
+    MANUFACTURER,
+    MODEL,
+    DEFAULT_PORT,
+    DEFAULT_UNIT_ID,
+    BYTE_ORDER_ADDRESS,
+    BYTE_ORDER_BIG,
+    BYTE_ORDER_LITTLE,
+    POLL_TIER_FAST,
+    POLL_TIER_NORMAL,
+    POLL_TIER_ONCE,
+    POLL_TIER_SAMPLE,
+    POLL_TIER_INTERVALS,
+    INVERTER_IDLE_STATES,
+    IDLE_POLL_INTERVAL,
+    IDENTITY_REGISTERS,
+    STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    RESTORE_GRACE_PERIOD,
+)
+from .connection import (
+    KostalModbusConnection,
+    ModbusResponseError,
+    async_get_shared_connection,
+    async_release_shared_connection,
+)
+from .pipeline import DEFAULT_MAX_IN_FLIGHT
+from .read_plan import DEFAULT_MAX_GAP, build_read_plan
+from .decoder import BlockDecoder, compile_decoders, encode_value
+from .register_buffer import RegisterBuffer
+from .write_queue import WriteQueue
+from .metrics import PollMetrics
+from .circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from .energy_flow import ENERGY_FLOW_REGISTERS, PV_REGISTERS, compute_energy_flow
+from .sampling import SampleWindow
+from .integration import EnergyIntegrator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Registers the coordinator itself needs, regardless of the entities
+INVERTER_STATE_ADDRESS = 56
+INVERTER_STATE_SPAN = (INVERTER_STATE_ADDRESS, 2)
+
+# Seconds between two log entries of the same recurring read error
+LOG_INTERVAL = 3600
+
 class InverterCoordinator(DataUpdateCoordinator):
     """Inverter coordinator.
 
+    Registers are polled in tiers. The coordinator ticks at the interval of
+    the fastest tier in use and reads the blocks of the tiers that are due;
+    registers of the other tiers keep their last values. Each block is
+    decoded once per poll into typed values that entities look up.
+
+    While the inverter is Off, in Standby or Shutdown the registers that are
+    shed when idle (PV, phases, yields) are not polled and the coordinator
+    ticks at IDLE_POLL_INTERVAL at most. The full plan is read again as soon
+    as another inverter state is seen.
+
+    Registers of the sample tier are read every second into sample windows,
+    their entities write one state per sample_window seconds with the mean,
+    min and max of the window.
+
+    Power registers can be integrated into import and export energy at
+    every read; the counters are kept in the snapshot across restarts.
+
+    The registers read are saved to a snapshot. On the next start the
+    entities show the values of the snapshot, marked as restored, until the
+    inverter has been polled. Failed polls keep them until the circuit
+    breaker opens or RESTORE_GRACE_PERIOD has passed.
+
     The CoordinatorEntity class provides:
         should_poll
         async_update
@@ -36,7 +101,7 @@ class InverterCoordinator(DataUpdateCoordinator):
     """
 
 
-    def __init__(self, hass, entry, ip_address):
+    def __init__(self, hass, entry, ip_address, max_gap=DEFAULT_MAX_GAP, pipelined=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, tier_intervals=POLL_TIER_INTERVALS, port=DEFAULT_PORT, unit_id=DEFAULT_UNIT_ID, sample_window=None):
         """Initialize coordinator."""
         super().__init__(
             hass,
@@ -44,13 +109,64 @@ class InverterCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name=DOMAIN,
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=15),
+            update_interval=timedelta(seconds=tier_intervals[POLL_TIER_NORMAL]),
         )
 
         self._hass = hass
         self._entry = entry
         self._ip_address = ip_address
-        self._modbus_lock = asyncio.Lock()
+        self._port = port
+        self._unit_id = unit_id
+        # Entries for the same host:port share the connection and serialize their transactions
+        self._connection = async_get_shared_connection(hass, entry.entry_id, ip_address, port, pipelined, max_in_flight)
+        self._modbus_lock = self._connection.lock
+        self._write_queue = WriteQueue(hass, self._async_write_block)
+        self._tier_intervals = tier_intervals
+        self._tier_spans: dict[str, Counter[tuple[int, int]]] = {
+            POLL_TIER_NORMAL: Counter({INVERTER_STATE_SPAN: 1})
+        }
+        # Subset of _tier_spans polled while the inverter is idle
+        self._idle_tier_spans: dict[str, Counter[tuple[int, int]]] = {
+            POLL_TIER_NORMAL: Counter({INVERTER_STATE_SPAN: 1})
+        }
+        self._idle = False
+        # Register 5, read once after setup
+        self._byte_order: int | None = None
+        self._max_gap = max_gap
+        self._fields: Counter[tuple[int, int, str]] = Counter({(*INVERTER_STATE_SPAN, "U32"): 1})
+        self._read_plans: dict[tuple[frozenset[str], bool], list[BlockDecoder]] = {}
+        self._last_polled: dict[str, float] = {}
+        self._once_polled_connects = 0
+        self._registers = RegisterBuffer()
+        self._layout_dirty = True
+        self._values: dict[int, int | float | str | bool] = {}
+        self._energy_flow: dict[str, float | None] = {}
+        # Seconds aggregated per state of sampled registers, None: sampling off
+        self._sample_window = sample_window
+        self._samplers: dict[int, SampleWindow] = {}
+        # Sampled registers not polled while the inverter is idle
+        self._shed_samplers: set[int] = set()
+        self._closed_windows: set[int] = set()
+        self._integrators: dict[int, EnergyIntegrator] = {}
+        # Counters of the snapshot for integrators not created yet: address: (imported, exported)
+        self._energy_totals: dict[int, tuple[float, float]] = {}
+        self._updated_blocks: list[tuple[int, int]] = []
+        # Entities to notify when their registers are read back after a write: (address, count, read_back_callback)
+        self._register_listeners: list[tuple[int, int, Callable[[], None]]] = []
+        self._metrics = PollMetrics()
+        self._breaker = CircuitBreaker()
+        self._logged_errors: dict[tuple[int, int, int | None], tuple[float, int]] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._snapshot: dict | None = None
+        self._restored = False
+        self._restored_at = 0.0
+        # Blocks read since startup, what the snapshot consists of
+        self._known_blocks: set[tuple[int, int]] = set()
+        # Strings of IDENTITY_REGISTERS, read after every (re)connect
+        self._identity: dict[str, str] = {}
+        self._identity_connects = 0
+        # async_shutdown is called on unload and again by the config entry
+        self._shut_down = False
 
         hass.data.setdefault(DOMAIN, {})
         hass.data[DOMAIN].setdefault(entry.entry_id, {
@@ -60,142 +176,677 @@ class InverterCoordinator(DataUpdateCoordinator):
                     "status": "OFFLINE"
                 })
 
+    @property
+    def device_id(self) -> str:
+        """Identifier of the device of the entities."""
+        return f"{NAME}_{self.device_address.replace('.', '_')}"
+
+    @property
+    def identity(self) -> dict[str, str]:
+        """Article and serial number, versions and product name read from the inverter."""
+        return self._identity
+
     @property
     def device_info(self):
         """Return information to link this entity with the correct device."""
+        identity = self._identity
+        model = " ".join(filter(None, (identity.get("product_name"), identity.get("power_class"))))
+        sw_version = identity.get("software_version")
+        versions = ", ".join(
+            f"{label} {identity[key]}" for label, key in (("MC", "mc_version"), ("IOC", "ioc_version")) if identity.get(key)
+        )
+        if versions:
+            sw_version = f"{sw_version} ({versions})" if sw_version else versions
         return {
-            "identifiers": {
-                (DOMAIN, self._entry.entry_id)
-                },
+            "identifiers": {(DOMAIN, self.device_id)},
             "name": NAME,
             "manufacturer": MANUFACTURER,
-            "model": MODEL
+            "model": model or MODEL,
+            "serial_number": identity.get("serial_number"),
+            "hw_version": identity.get("article_number"),
+            "sw_version": sw_version,
         }
 
-    async def _async_update_data(self):
-        """Fetch data from API endpoint.
+    @property
+    def connection(self) -> KostalModbusConnection:
+        """Persistent connection, exposes connect/reuse counters."""
+        return self._connection
 
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
+    @property
+    def unit_id(self) -> int:
+        """Modbus unit id of the inverter."""
+        return self._unit_id
+
+    @property
+    def device_address(self) -> str:
+        """IP address, with port and unit id where they differ from the defaults.
+
+        Entities derive their unique ids from it, so several inverters
+        behind one endpoint get their own entities and devices.
         """
-        async with self._modbus_lock:
+        address = self._ip_address
+        if self._port != DEFAULT_PORT:
+            address += f"_port{self._port}"
+        if self._unit_id != DEFAULT_UNIT_ID:
+            address += f"_unit{self._unit_id}"
+        return address
 
-            client = AsyncModbusTcpClient(self._ip_address, port=1502)  # IP-Adresse und Port des Inverters
+    @property
+    def write_queue(self) -> WriteQueue:
+        """Write queue, exposes requested/sent counters."""
+        return self._write_queue
 
-            data = {
-                "inverter_state": 18,
-                "registers": [0 for _ in range(1083)]
-            }
+    @property
+    def metrics(self) -> PollMetrics:
+        """Durations of the poll cycles and freshness of the data."""
+        return self._metrics
 
-            # Optimized read plan (<=125 regs each). Covers:
-            # - inverter_state (56..57) + all sensors/numbers used by this integration
-
-            READ_BLOCKS: Final[list[tuple[int, int]]] = [
-                    (56, 2),  # inverter state (uint32 via word-swap)
-                    (98, 22),  # 98..119  (controller temp + consumption/power/energy around 100..118)
-                    (144, 2),  # worktime
-                    (156, 18),  # 156..173  (AC power phases)
-                    (194, 94),  # 194..287  (battery/house/grid + DC currents/powers/voltages)
-                    (320, 8),  # 320..327  (yields)
-                    (512, 18),  # 512..529  (battery SOC etc.)
-                    # (580, 18),  # 580..599  (battery charge power)
-                    # (1024, 8),  # 1024..1031 (charge setpoint + scale factor + charge power number @1030)
-                    (1042, 38),  # 1042..1079 (min/max soc + totals + battery work cap + max ch/disch)
-            ]
-
-            async def read_holding_registers(address, count):
-                result = await client.read_holding_registers(address, count=count, device_id=71)
-                if not result.isError():
-                    data["registers"][address:address+count] = result.registers
-                else:
-                    _LOGGER.error("Error reading registers: addr=%s count=%s", address, count)
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Circuit breaker guarding the polls."""
+        return self._breaker
 
-            try:
-                connection = await client.connect()
-
-                if connection:
-                    for addr, cnt in READ_BLOCKS:
-                        await read_holding_registers(addr, cnt)
-                        await asyncio.sleep(0.05)
-
-                    # Inverter state decode from buffered registers (56..57) - word swap for CDAB
-                    inv_regs = data["registers"][56:58]
-                    data["inverter_state"] = client.convert_from_registers(
-                        registers = list(reversed(inv_regs)),
-                        data_type = client.DATATYPE.UINT32
-                    )
+    @property
+    def statistics(self) -> dict[str, float | int | None]:
+        """Modbus health and poll performance, times in milliseconds (data age in seconds)."""
+        latencies = self._connection.latencies
 
-                else:
-                    _LOGGER.error("Connection failed")
+        def milliseconds(seconds):
+            return None if seconds is None else round(1000 * seconds, 1)
 
-            except ModbusException as e:
-                _LOGGER.error(f"Modbus error: {e}")
+        return {
+            "last_cycle_duration": milliseconds(self._metrics.last_cycle),
+            "average_cycle_duration": milliseconds(self._metrics.average_cycle),
+            "block_latency_p50": milliseconds(latencies.percentile(50)),
+            "block_latency_p95": milliseconds(latencies.percentile(95)),
+            "block_latency_p99": milliseconds(latencies.percentile(99)),
+            "timeouts": self._connection.timeouts,
+            "exception_responses": self._connection.exception_responses,
+            "reconnects": max(self._connection.connects - 1, 0),
+            "connect_failures": self._connection.connect_failures,
+            "data_age": None if (age := self._metrics.data_age()) is None else round(age, 1),
+        }
 
-            finally:
-                client.close()
+    @property
+    def max_gap(self) -> int:
+        """Unused registers that may be read to merge two blocks."""
+        return self._max_gap
 
-            return data
+    @max_gap.setter
+    def max_gap(self, value: int) -> None:
+        self._max_gap = value
+        self._read_plans.clear()
+        self._layout_dirty = True
 
-    async def async_set_min_soc(self, value: float) -> None:
-        """set minimum soc"""        
-        _LOGGER.warn("InverterCoordinator async_set_min_soc")
+    @property
+    def byte_order(self) -> int:
+        """Byte order configured in the inverter, little endian (CDAB) until it has been read."""
+        return BYTE_ORDER_LITTLE if self._byte_order is None else self._byte_order
 
-        async with self._modbus_lock:
+    @property
+    def idle(self) -> bool:
+        """Whether the inverter is Off, in Standby or Shutdown."""
+        return self._idle
 
-            client = AsyncModbusTcpClient(self._ip_address, port=1502)  # IP-Adresse und Port des Inverters
+    @property
+    def restored(self) -> bool:
+        """Whether the values come from the snapshot of the last run and have not been polled yet."""
+        return self._restored
 
-            try:
-                connection = await client.connect()
-                if connection:
+    @property
+    def read_plan(self) -> list[tuple[int, int]]:
+        """Block reads covering the registers of all tiers."""
+        return [(decoder.address, decoder.count) for decoder in self._plan_for(frozenset(self._tier_spans))]
+
+    def _polled_spans(self) -> dict[str, Counter[tuple[int, int]]]:
+        """Spans per tier polled in the current inverter state."""
+        return self._idle_tier_spans if self._idle else self._tier_spans
+
+    def _plan_for(self, tiers: frozenset[str]) -> list[BlockDecoder]:
+        """Block reads with their decoders for the given tiers, rebuilt after changes."""
+        key = (tiers, self._idle)
+        plan = self._read_plans.get(key)
+        if plan is None:
+            tier_spans = self._polled_spans()
+            spans = [span for tier in tiers for span in tier_spans.get(tier, ())]
+            plan = self._read_plans[key] = compile_decoders(build_read_plan(spans, self._max_gap), self._fields, self.byte_order)
+            _LOGGER.debug("Read plan for %s%s: %s", sorted(tiers), " (idle)" if self._idle else "", [(d.address, d.count) for d in plan])
+        return plan
+
+    def _due_tiers(self, now: float) -> frozenset[str]:
+        """Tiers whose interval has passed, with half a tick tolerance."""
+        tolerance = self.update_interval.total_seconds() / 2
+        due = set()
+        for tier, spans in self._polled_spans().items():
+            if not spans:
+                continue
+            if tier == POLL_TIER_ONCE:
+                if tier not in self._last_polled or self._once_polled_connects != self._connection.connects:
+                    due.add(tier)
+            elif now - self._last_polled.get(tier, -float("inf")) >= self._tier_intervals[tier] - tolerance:
+                due.add(tier)
+        return frozenset(due)
+
+    def is_updated(self, address: int, count: int = 1) -> bool:
+        """Whether the last poll read registers address..address+count-1."""
+        if not self.last_update_success:
+            return True
+        return self._was_read(address, count)
+
+    def _was_read(self, address: int, count: int) -> bool:
+        return any(start <= address and address + count <= start + cnt for start, cnt in self._updated_blocks)
+
+    def _layout_registers(self) -> None:
+        """Size the register buffer to the address ranges of all tiers.
+
+        The extents merge spans like the read plan but without the request
+        size limit, so every block of every tier plan lies in one segment.
+        """
+        spans = [span for spans in self._tier_spans.values() for span in spans]
+        self._registers.layout(build_read_plan(spans, self._max_gap, max_count=sys.maxsize))
+        self._layout_dirty = False
+        self._known_blocks = {block for block in self._known_blocks if self._is_buffered(*block)}
+
+    def _is_buffered(self, address: int, count: int) -> bool:
+        try:
+            self._registers.view(address, count)
+        except KeyError:
+            return False
+        return True
+
+    def value(self, address: int):
+        """Decoded value of the register at address, None until it has been read."""
+        return self._values.get(address)
+
+    @property
+    def sample_window(self) -> float | None:
+        """Seconds aggregated per state of sampled registers, None if sampling is off."""
+        return self._sample_window
 
-                    registers = client.convert_to_registers(value=value, data_type=client.DATATYPE.FLOAT32)
-                    # Check!
-                    result = await client.write_registers(1042, values=list(reversed(registers)), device_id=71)
-                    # Check!
-                    if result.isError():
-                        _LOGGER.error("Error writing registers")
+    @property
+    def sampled_registers(self) -> list[int]:
+        """Addresses of the registers sampled per window."""
+        return list(self._samplers)
 
-                else:
-                    _LOGGER.error("Connection failed")
+    def window(self, address: int) -> dict[str, float | int] | None:
+        """Mean, min, max and last of the last closed sample window of a register."""
+        sampler = self._samplers.get(address)
+        return None if sampler is None else sampler.aggregate
 
-            except ModbusException as e:
-                _LOGGER.error(f"Modbus error: {e}")
+    def is_window_closed(self, address: int) -> bool:
+        """Whether the last poll closed the sample window of the register at address."""
+        return address in self._closed_windows
 
-            finally:
-                client.close()
+    @property
+    def integrated_registers(self) -> list[int]:
+        """Addresses of the power registers integrated into energy."""
+        return list(self._integrators)
 
-    async def async_set_float_value(self, address: int, value: float) -> None:
-        """Set Float Value"""
+    def integrator(self, address: int) -> EnergyIntegrator | None:
+        """Import and export energy integrated from the power register at address."""
+        return self._integrators.get(address)
 
+    @property
+    def energy_flow(self) -> dict[str, float | None]:
+        """Power flows between PV, battery, grid and home of the last poll."""
+        return self._energy_flow
+
+    @callback
+    def async_add_register_span(self, address: int, count: int, tier: str = POLL_TIER_NORMAL, datatype: str | None = None, shed_when_idle: bool = False, read_back_callback: Callable[[], None] | None = None) -> Callable[[], None]:
+        """Request polling of registers address..address+count-1 in a tier.
+
+        With a datatype the registers are decoded after every read and
+        available through value(address). With shed_when_idle the registers
+        are not polled while the inverter is idle. read_back_callback is
+        called when the registers are read back after a write, the
+        coordinator listeners only after polls.
+        Returns a callback that withdraws the request again.
+        """
+        span = (address, count)
+        field = (address, count, datatype)
+        register_listener = None
+        if read_back_callback is not None:
+            register_listener = (address, count, read_back_callback)
+            self._register_listeners.append(register_listener)
+        self._tier_spans.setdefault(tier, Counter())[span] += 1
+        if not shed_when_idle:
+            self._idle_tier_spans.setdefault(tier, Counter())[span] += 1
+        if datatype is not None:
+            self._fields[field] += 1
+        # Read the new registers on the next tick instead of after a full interval
+        self._last_polled.pop(tier, None)
+        self._async_tiers_changed()
+
+        @callback
+        def remove_register_span() -> None:
+            polled_in = (self._tier_spans,) if shed_when_idle else (self._tier_spans, self._idle_tier_spans)
+            for tier_spans in polled_in:
+                spans = tier_spans[tier]
+                spans[span] -= 1
+                if spans[span] <= 0:
+                    del spans[span]
+            if datatype is not None:
+                self._fields[field] -= 1
+                if self._fields[field] <= 0:
+                    del self._fields[field]
+            if register_listener is not None:
+                self._register_listeners.remove(register_listener)
+            self._async_tiers_changed()
+
+        return remove_register_span
+
+    @callback
+    def async_add_sampled_register(self, address: int, count: int, datatype: str, shed_when_idle: bool = False) -> Callable[[], None]:
+        """Request sampling of a register in the sample tier, aggregated per sample_window.
+
+        Returns a callback that withdraws the request again.
+        """
+        remove_register_span = self.async_add_register_span(address, count, POLL_TIER_SAMPLE, datatype, shed_when_idle)
+        self._samplers[address] = SampleWindow(self._sample_window, self._tier_intervals[POLL_TIER_SAMPLE])
+        if shed_when_idle:
+            self._shed_samplers.add(address)
+
+        @callback
+        def remove_sampled_register() -> None:
+            remove_register_span()
+            self._samplers.pop(address, None)
+            self._shed_samplers.discard(address)
+
+        return remove_sampled_register
+
+    @callback
+    def async_add_integrated_register(self, address: int, tier: str = POLL_TIER_FAST) -> Callable[[], None]:
+        """Request polling of a Float power register and integrate it into energy.
+
+        The register is integrated at every read, also of other tiers. The
+        counters persist when the request is withdrawn.
+        Returns a callback that withdraws the request again.
+        """
+        if address not in self._integrators:
+            self._integrators[address] = EnergyIntegrator(*self._energy_totals.pop(address, (0.0, 0.0)))
+        return self.async_add_register_span(address, 2, tier, "Float")
+
+    @callback
+    def _async_tiers_changed(self) -> None:
+        """Drop cached plans and tick at the fastest tier in use."""
+        self._read_plans.clear()
+        self._layout_dirty = True
+        self._async_update_interval()
+
+    @callback
+    def _async_update_interval(self) -> None:
+        """Tick at the fastest tier polled in the current inverter state."""
+        intervals = [
+            self._tier_intervals[tier]
+            for tier, spans in self._polled_spans().items()
+            if spans and tier in self._tier_intervals
+        ]
+        interval = min(intervals, default=self._tier_intervals[POLL_TIER_NORMAL])
+        if self._idle:
+            interval = max(interval, IDLE_POLL_INTERVAL)
+        self.update_interval = timedelta(seconds=interval)
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and close the Modbus connection, once."""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        await super().async_shutdown()
+        await self._write_queue.async_flush()
+        if self._known_blocks:
+            await self._store.async_save(self._snapshot_data())
         async with self._modbus_lock:
+            await async_release_shared_connection(self._hass, self._entry.entry_id, self._connection)
+
+    async def async_load_snapshot(self) -> bool:
+        """Load the register snapshot of the last run, False if there is none."""
+        try:
+            self._snapshot = await self._store.async_load()
+        except HomeAssistantError as e:
+            _LOGGER.warning("Loading the register snapshot failed: %s", e)
+            self._snapshot = None
+        if self._snapshot:
+            self._identity = self._snapshot.get("identity", {})
+            self._energy_totals = {int(address): tuple(totals) for address, totals in self._snapshot.get("energy", {}).items()}
+        return bool(self._snapshot and self._snapshot.get("blocks"))
+
+    @callback
+    def async_apply_snapshot(self) -> None:
+        """Show the values of the loaded snapshot until the first poll.
+
+        Called after the entities registered their registers, only blocks
+        of the read plan that were read by the last run are decoded.
+        """
+        snapshot, self._snapshot = self._snapshot, None
+        if not snapshot:
+            return
+        saved = RegisterBuffer()
+        saved.layout((address, len(words)) for address, words in snapshot["blocks"])
+        for address, words in snapshot["blocks"]:
+            saved.update(address, words)
+
+        if self._layout_dirty:
+            self._layout_registers()
+        restored = []
+        # The byte order is read again by the first poll, the snapshot's is only used to decode it
+        for decoder in compile_decoders(self.read_plan, self._fields, snapshot["byte_order"]):
+            try:
+                words = self._registers.update(decoder.address, saved.view(decoder.address, decoder.count))
+            except KeyError:
+                continue
+            self._values.update(decoder.decode(words))
+            restored.append((decoder.address, decoder.count))
+        if not restored:
+            return
+
+        _LOGGER.debug("Restored %s blocks from a snapshot %.0f s old", len(restored), time.time() - snapshot["time"])
+        self._restored = True
+        self._restored_at = time.monotonic()
+        self._metrics.last_success = time.monotonic() - max(time.time() - snapshot["time"], 0)
+        self._updated_blocks = restored
+        self._energy_flow = compute_energy_flow(self._values, self._values.get(INVERTER_STATE_ADDRESS) in INVERTER_IDLE_STATES)
+        self.async_set_updated_data({
+            "inverter_state": self._values.get(INVERTER_STATE_ADDRESS, 18),
+            "registers": self._registers,
+            "values": self._values,
+            "energy_flow": self._energy_flow,
+        })
+
+    @callback
+    def _snapshot_data(self) -> dict:
+        """Registers of the blocks read so far, merged into disjoint ranges.
+
+        Overlapping and adjacent blocks always lie in one buffer segment.
+        """
+        blocks = []
+        for address, count in build_read_plan(self._known_blocks, 0, max_count=sys.maxsize):
+            blocks.append([address, self._registers.view(address, count).tolist()])
+        age = self._metrics.data_age()
+        return {
+            "time": time.time() - (age or 0),
+            "byte_order": self.byte_order,
+            "blocks": blocks,
+            "identity": self._identity,
+            "energy": {
+                **{str(address): list(totals) for address, totals in self._energy_totals.items()},
+                **{str(address): [integrator.imported, integrator.exported] for address, integrator in self._integrators.items()},
+            },
+        }
 
-            client = AsyncModbusTcpClient(self._ip_address, port=1502)  # IP-Adresse und Port des Inverters
+    async def _async_update_data(self):
+        """Fetch data from API endpoint.
 
-            try:
-                connection = await client.connect()
-                if connection:
+        This is the place to pre-process the data to lookup tables
+        so entities can quickly look up their data.
+        Raises UpdateFailed, which makes the entities unavailable, while the
+        inverter cannot be reached.
+        """
+        async with self._modbus_lock:
+
+            data = {
+                "inverter_state": 18,
+                "registers": self._registers,
+                "values": self._values,
+                "energy_flow": self._energy_flow
+            }
+            self._updated_blocks = []
+            self._closed_windows = set()
+            started = time.monotonic()
+
+            state = self._breaker.allow(started)
+            if state == STATE_OPEN:
+                raise UpdateFailed(f"Inverter unreachable, next attempt in {self._breaker.retry_at - started:.0f} s")
+            if not self.last_update_success:
+                # Entities are unavailable, read every tier to bring them back
+                self._last_polled.clear()
 
-                    registers = client.convert_to_registers(value=value, data_type=client.DATATYPE.FLOAT32)
-                    # Check!
-                    result = await client.write_registers(address, values=list(reversed(registers)), device_id=71)
-                    # Check!
-                    if result.isError():
-                        _LOGGER.error("Error writing registers")
+            # Ticks without due blocks do not count as poll cycles
+            polled = True
+            errors = []
 
-                else:
-                    _LOGGER.error("Connection failed")
+            try:
+                # Probes of an open circuit are expected to fail, keep pymodbus quiet about them
+                if not await self._connection.async_ensure_connected(quiet=state != STATE_CLOSED):
+                    raise ConnectionException("Connection failed")
+                if state == STATE_HALF_OPEN:
+                    await self._async_probe()
+                if self._identity_connects != self._connection.connects:
+                    await self._async_read_identity()
+                if self._byte_order is None:
+                    await self._async_read_byte_order()
+                if self._layout_dirty:
+                    self._layout_registers()
+                now = time.monotonic()
+                tiers = self._due_tiers(now)
+                plan = self._plan_for(tiers)
+                polled = bool(plan)
+                await self._async_read_plan(plan, errors)
+                for tier in tiers:
+                    self._last_polled[tier] = now
+                self._once_polled_connects = self._connection.connects
+
+                idle = self._values.get(INVERTER_STATE_ADDRESS) in INVERTER_IDLE_STATES
+                if idle != self._idle:
+                    _LOGGER.debug("Inverter %s, %s polling", "idle" if idle else "active", "reduced" if idle else "full")
+                    self._idle = idle
+                    self._async_update_interval()
+                    if idle:
+                        # The windows of shed registers would keep their last mean, close them empty
+                        for address in self._shed_samplers:
+                            self._samplers[address].reset()
+                            self._closed_windows.add(address)
+                    else:
+                        # Read the registers shed while idle right away
+                        self._last_polled.clear()
+                        tiers = self._due_tiers(now)
+                        await self._async_read_plan(self._plan_for(tiers), errors)
+                        for tier in tiers:
+                            self._last_polled[tier] = now
+
+                data["inverter_state"] = self._values.get(INVERTER_STATE_ADDRESS, data["inverter_state"])
 
             except ModbusException as e:
-                _LOGGER.error(f"Modbus error: {e}")
+                errors.append(f"Modbus error: {e}")
+                self._metrics.record_cycle(time.monotonic() - started, False, 0, errors)
+                if self._breaker.record_failure(time.monotonic()):
+                    _LOGGER.warning(
+                        "Inverter %s unreachable after %s failed polls, next attempt in %.0f s",
+                        self._ip_address, self._breaker.failures, self._breaker.retry_at - time.monotonic(),
+                    )
+                elif self._breaker.state == STATE_OPEN:
+                    # Failed probes are expected
+                    _LOGGER.debug(
+                        "Inverter %s still unreachable, next attempt in %.0f s",
+                        self._ip_address, self._breaker.retry_at - time.monotonic(),
+                    )
+                if self._restored and self._breaker.state == STATE_CLOSED and time.monotonic() - self._restored_at < RESTORE_GRACE_PERIOD:
+                    # Keep showing the snapshot instead of making every entity unavailable right after startup
+                    _LOGGER.debug("Inverter %s not answering yet, showing the restored values: %s", self._ip_address, e)
+                    data["inverter_state"] = self._values.get(INVERTER_STATE_ADDRESS, data["inverter_state"])
+                    return data
+                raise UpdateFailed(f"Modbus error: {e}") from e
+
+            if self._breaker.record_success():
+                _LOGGER.info("Inverter %s answers again", self._ip_address)
+            if self._samplers:
+                now = time.monotonic()
+                for address, sampler in self._samplers.items():
+                    if sampler.due(now):
+                        sampler.close()
+                        self._closed_windows.add(address)
+            if all(self._was_read(address, 2) for address in ENERGY_FLOW_REGISTERS if not (self._idle and address in PV_REGISTERS)):
+                # All flows from the values of one poll, not from sampled registers alone
+                data["energy_flow"] = self._energy_flow = compute_energy_flow(self._values, self._idle)
+            if self._updated_blocks:
+                self._restored = False
+                self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+            if polled:
+                self._metrics.record_cycle(time.monotonic() - started, bool(self._updated_blocks), len(self._updated_blocks), errors)
+            return data
 
-            finally:
-                client.close()
+    async def _async_read_plan(self, plan: list[BlockDecoder], errors: list[str]) -> None:
+        """Read and decode the blocks of a plan, exception responses are added to errors."""
+        results = await self._connection.async_read_blocks([(d.address, d.count) for d in plan], self._unit_id)
+        for decoder, result in zip(plan, results):
+            addr, cnt = decoder.address, decoder.count
+            if isinstance(result, ModbusResponseError):
+                self._log_read_error(addr, cnt, result)
+                errors.append(f"{result} (exception code {result.exception_code})")
+            else:
+                values = decoder.decode(self._registers.update(addr, result))
+                self._values.update(values)
+                self._updated_blocks.append((addr, cnt))
+                if self._samplers or self._integrators:
+                    now = time.monotonic()
+                    for address in self._samplers.keys() & values.keys():
+                        self._samplers[address].add(values[address], now)
+                    for address in self._integrators.keys() & values.keys():
+                        self._integrators[address].add(values[address], now)
+                self._known_blocks.add((addr, cnt))
+
+    async def _async_read_identity(self) -> None:
+        """Read the identity registers and update the device and the config entry with them.
+
+        Registers the inverter does not know (exception responses) are left out.
+        """
+        fields = [(address, count, "String") for address, count in IDENTITY_REGISTERS.values()]
+        plan = compile_decoders(build_read_plan([field[:2] for field in fields], self._max_gap), fields)
+        results = await self._connection.async_read_blocks([(d.address, d.count) for d in plan], self._unit_id)
+        values = {}
+        for decoder, result in zip(plan, results):
+            if isinstance(result, ModbusResponseError):
+                _LOGGER.debug("Reading identity registers %s..%s failed: %s", decoder.address, decoder.address + decoder.count - 1, result)
+            else:
+                values.update(decoder.decode(result))
+        self._identity_connects = self._connection.connects
+
+        identity = {key: values[address] for key, (address, _) in IDENTITY_REGISTERS.items() if values.get(address)}
+        if identity == self._identity:
+            return
+        self._identity = identity
+        _LOGGER.debug("Inverter %s identity: %s", self._ip_address, identity)
+        self._async_update_device()
+
+    @callback
+    def _async_update_device(self) -> None:
+        """Write the identity to the device registry and the config entry."""
+        info = self.device_info
+        device_registry = dr.async_get(self._hass)
+        device = device_registry.async_get_device(identifiers=info["identifiers"])
+        if device is not None:
+            device_registry.async_update_device(
+                device.id,
+                model=info["model"],
+                serial_number=info["serial_number"],
+                hw_version=info["hw_version"],
+                sw_version=info["sw_version"],
+            )
+
+        serial_number = self._identity.get("serial_number")
+        if serial_number is None or self._entry.unique_id is not None:
+            return
+        # Several units behind one gateway have their own serial numbers
+        if self._hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, serial_number) is None:
+            self._hass.config_entries.async_update_entry(self._entry, unique_id=serial_number)
+
+    async def _async_read_byte_order(self) -> None:
+        """Read the byte order from register 5, decoders are compiled for it."""
+        try:
+            value = (await self._connection.async_read_holding_registers(BYTE_ORDER_ADDRESS, 1, self._unit_id))[0]
+        except ModbusResponseError as e:
+            _LOGGER.warning("Reading the byte order failed, assuming little endian (CDAB): %s", e)
+            value = BYTE_ORDER_LITTLE
+        if value not in (BYTE_ORDER_LITTLE, BYTE_ORDER_BIG):
+            _LOGGER.warning("Unknown byte order %s, assuming little endian (CDAB)", value)
+            value = BYTE_ORDER_LITTLE
+        if value == BYTE_ORDER_BIG:
+            _LOGGER.info("Inverter %s uses big endian (ABCD) byte order", self._ip_address)
+        self._byte_order = value
+        self._read_plans.clear()
+
+    async def _async_probe(self) -> None:
+        """Check with a single small read whether the inverter answers again."""
+        try:
+            await self._connection.async_read_holding_registers(*INVERTER_STATE_SPAN, self._unit_id)
+        except ModbusResponseError:
+            # An exception response is an answer as well
+            pass
+
+    def _log_read_error(self, address: int, count: int, error: ModbusResponseError) -> None:
+        """Log a failed block read, repetitions at most every LOG_INTERVAL seconds."""
+        now = time.monotonic()
+        key = (address, count, error.exception_code)
+        logged_at, suppressed = self._logged_errors.get(key, (None, 0))
+        if logged_at is not None and now - logged_at < LOG_INTERVAL:
+            self._logged_errors[key] = (logged_at, suppressed + 1)
+            _LOGGER.debug("Error reading registers: addr=%s count=%s", address, count)
+            return
+        self._logged_errors[key] = (now, 0)
+        if suppressed:
+            _LOGGER.error("Error reading registers: addr=%s count=%s (%s more since last report)", address, count, suppressed)
+        else:
+            _LOGGER.error("Error reading registers: addr=%s count=%s", address, count)
 
-    def read_float32(self, address: int) -> float:
-        return AsyncModbusTcpClient.convert_from_registers(registers=list(reversed(self.data["registers"][address:address+2])), data_type=AsyncModbusTcpClient.DATATYPE.FLOAT32)
+    async def async_set_min_soc(self, value: float) -> None:
+        """set minimum soc"""        
+        _LOGGER.warning("InverterCoordinator async_set_min_soc")
+        await self.async_set_float_value(1042, value)
+
+    async def async_set_float_value(self, address: int, value: float) -> bool:
+        """Set Float Value, returns whether it was written"""
+
+        try:
+            await self.async_queue_write(address, encode_value(value, "Float", self.byte_order))
+
+        except ModbusResponseError:
+            _LOGGER.error("Error writing registers")
+
+        except ModbusException as e:
+            _LOGGER.error("Modbus error: %s", e)
+
+        else:
+            return True
+        return False
 
-    def read_int16(self, address: int) -> int:
-        return AsyncModbusTcpClient.convert_from_registers(registers=list(self.data["registers"][address:address+1]), data_type=AsyncModbusTcpClient.DATATYPE.INT16)
+    @callback
+    def async_queue_write(self, address: int, words: list[int]) -> asyncio.Future:
+        """Queue raw register words for writing.
 
-    def read_uint16(self, address: int) -> int:
-        return AsyncModbusTcpClient.convert_from_registers(registers=list(self.data["registers"][address:address+1]), data_type=AsyncModbusTcpClient.DATATYPE.UINT16)
+        Writes are debounced and merged with adjacent ones, the returned
+        future resolves once the words (or newer ones) have been written.
+        """
+        return self._write_queue.async_write(address, words)
+
+    async def _async_write_block(self, address: int, words: list[int]) -> None:
+        """Write a merged block of registers and read it back."""
+        async with self._modbus_lock:
+            if not await self._connection.async_ensure_connected():
+                raise ConnectionException("Connection failed")
+            await self._connection.async_write_registers(address, words, self._unit_id)
+            try:
+                registers = await self._connection.async_read_holding_registers(address, len(words), self._unit_id)
+            except ModbusResponseError as e:
+                _LOGGER.debug("Read-back of registers %s..%s failed: %s", address, address + len(words) - 1, e)
+                return
+            # Under the lock, so a poll cannot store older values over the read-back
+            self._async_patch_registers(address, registers)
+
+    @callback
+    def _async_patch_registers(self, address: int, registers: list[int]) -> None:
+        """Store registers read outside a poll and notify the entities using them.
+
+        Only the read-back callbacks of spans overlapping the registers are
+        called; diagnostics, energy flow and subscriptions wait for the
+        next poll. The state of the poll (updated blocks, closed windows)
+        is left alone, its listeners may not have been notified yet.
+        """
+        try:
+            words = self._registers.update(address, registers)
+        except KeyError:
+            words = registers
+        decoder = compile_decoders([(address, len(registers))], self._fields, self.byte_order)[0]
+        self._values.update(decoder.decode(words))
+        end = address + len(registers)
+        for start, count, read_back_callback in list(self._register_listeners):
+            if start < end and address < start + count:
+                read_back_callback()
@@ -0,0 +1,131 @@
+"""Bulk decoding of block reads into typed register values, and encoding of writes."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import struct
+import sys
+
+from .const import BYTE_ORDER_BIG, BYTE_ORDER_LITTLE
+
+# Registers used by each datatype of KOSTAL_Register.py (String: given per register)
+DATATYPE_REGISTERS = {
+    "Bool": 1,
+    "U8": 1,
+    "S8": 1,
+    "U16": 1,
+    "S16": 1,
+    "U32": 2,
+    "S32": 2,
+    "Float": 2,
+}
+
+# struct codes of the datatypes. For the CDAB ("little endian") word order
+# the words of a block are packed little endian, which turns every 32 bit
+# value into a plain little endian number; for ABCD ("big endian") they are
+# packed big endian. Either way no per-value word swapping is needed.
+_STRUCT_CODES = {
+    "Bool": "H",
+    "U8": "H",
+    "S8": "h",
+    "U16": "H",
+    "S16": "h",
+    "U32": "I",
+    "S32": "i",
+    "Float": "f",
+}
+
+
+def decode_string(words: Sequence[int]) -> str:
+    """Decode a String register (two ASCII characters per word, high byte first)."""
+    return struct.pack(f">{len(words)}H", *words).split(b"\0", 1)[0].decode("ascii", "replace").strip()
+
+
+class BlockDecoder:
+    """Decodes all fields inside one block read with a single struct call."""
+
+    __slots__ = ("address", "count", "_addresses", "_struct", "_strings", "_bools", "_order", "_in_place")
+
+    def __init__(self, address: int, count: int, fields: Iterable[tuple[int, int, str]], byte_order: int = BYTE_ORDER_LITTLE):
+        """
+        Args:
+            address (int): first register of the block
+            count (int): registers in the block
+            fields (iterable): (address, count, datatype) of the fields inside the block
+            byte_order (int): value of register 5, BYTE_ORDER_LITTLE (CDAB) or BYTE_ORDER_BIG (ABCD)
+        """
+        self.address = address
+        self.count = count
+        self._order = ">" if byte_order == BYTE_ORDER_BIG else "<"
+        # Register arrays hold native words, usable as they are if the host has the same byte order
+        self._in_place = (self._order == "<") == (sys.byteorder == "little")
+
+        fmt = [self._order]
+        offset = 0
+        addresses = []
+        strings = []
+        bools = []
+        for field_address, field_count, datatype in sorted(fields):
+            start = field_address - address
+            if start < offset or start + field_count > count:
+                # Overlaps the previous field or leaves the block
+                continue
+            if datatype == "String":
+                strings.append((field_address, start, field_count))
+                continue
+            code = _STRUCT_CODES.get(datatype)
+            if code is None:
+                continue
+            if start > offset:
+                fmt.append(f"{2 * (start - offset)}x")
+            fmt.append(code)
+            addresses.append(field_address)
+            if datatype == "Bool":
+                bools.append(field_address)
+            offset = start + field_count
+
+        self._addresses = tuple(addresses)
+        self._struct = struct.Struct("".join(fmt))
+        self._strings = tuple(strings)
+        self._bools = tuple(bools)
+
+    def decode(self, words: Sequence[int] | memoryview) -> dict[int, int | float | str | bool]:
+        """Decode the registers of the block into {address: value}.
+
+        A memoryview of an array('H') is decoded in place if the host has the
+        byte order of the inverter.
+        """
+        if isinstance(words, memoryview) and self._in_place:
+            raw = words
+        else:
+            raw = struct.pack(f"{self._order}{self.count}H", *words)
+        values = dict(zip(self._addresses, self._struct.unpack_from(raw)))
+        for address in self._bools:
+            values[address] = bool(values[address])
+        for address, start, count in self._strings:
+            values[address] = decode_string(words[start:start + count])
+        return values
+
+
+def compile_decoders(
+    plan: Iterable[tuple[int, int]],
+    fields: Iterable[tuple[int, int, str]],
+    byte_order: int = BYTE_ORDER_LITTLE,
+) -> list[BlockDecoder]:
+    """Build one BlockDecoder per block of the read plan."""
+    fields = sorted(set(fields))
+    return [
+        BlockDecoder(
+            address,
+            count,
+            [field for field in fields if address <= field[0] and field[0] + field[1] <= address + count],
+            byte_order,
+        )
+        for address, count in plan
+    ]
+
+
+def encode_value(value: int | float, datatype: str, byte_order: int = BYTE_ORDER_LITTLE) -> list[int]:
+    """Register words of a value to write."""
+    order = ">" if byte_order == BYTE_ORDER_BIG else "<"
+    count = DATATYPE_REGISTERS[datatype]
+    return list(struct.unpack(f"{order}{count}H", struct.pack(order + _STRUCT_CODES[datatype], value)))
@@ -0,0 +1,91 @@
+"""Diagnostics support for Kostal Plenticore Modbus."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_IP_ADDRESS
+
+TO_REDACT = {CONF_IP_ADDRESS, "serial_number"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    inverter_coordinator = entry.runtime_data.inverter_coordinator
+    connection = inverter_coordinator.connection
+    data = inverter_coordinator.data or {}
+    values = data.get("values", {})
+
+    blocks = []
+    for address, count in inverter_coordinator.read_plan:
+        try:
+            words = data["registers"].view(address, count).tolist()
+        except KeyError:
+            # Not polled yet
+            words = None
+        blocks.append({"address": address, "count": count, "registers": words})
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "identity": async_redact_data(inverter_coordinator.identity, TO_REDACT),
+        "connection": {
+            "port": connection.port,
+            "unit_id": inverter_coordinator.unit_id,
+            "shared_by": len(connection.users),
+            "connected": connection.connected,
+            "pipelined": connection.pipelined,
+            "connects": connection.connects,
+            "reuses": connection.reuses,
+            "connect_failures": connection.connect_failures,
+            "timeouts": connection.timeouts,
+            "exception_responses": connection.exception_responses,
+            "window": connection.pacer.window,
+            "smoothed_rtt": connection.pacer.smoothed_rtt,
+            "min_rtt": connection.pacer.min_rtt,
+        },
+        "circuit_breaker": {
+            "state": inverter_coordinator.breaker.state,
+            "failures": inverter_coordinator.breaker.failures,
+            "opened": inverter_coordinator.breaker.opened,
+        },
+        "statistics": inverter_coordinator.statistics,
+        "last_update_success": inverter_coordinator.last_update_success,
+        "restored": inverter_coordinator.restored,
+        "idle": inverter_coordinator.idle,
+        "byte_order": inverter_coordinator.byte_order,
+        "update_interval": inverter_coordinator.update_interval.total_seconds(),
+        "max_gap": inverter_coordinator.max_gap,
+        "polled_registers": sum(block["count"] for block in blocks),
+        "blocks": blocks,
+        "values": {str(address): values[address] for address in sorted(values)},
+        "energy_flow": inverter_coordinator.energy_flow,
+        "integrated_energy": {
+            str(address): {"imported": integrator.imported, "exported": integrator.exported}
+            for address in sorted(inverter_coordinator.integrated_registers)
+            if (integrator := inverter_coordinator.integrator(address)) is not None
+        },
+        "sample_window": inverter_coordinator.sample_window,
+        "sample_windows": {
+            str(address): inverter_coordinator.window(address) for address in sorted(inverter_coordinator.sampled_registers)
+        },
+        "poll_history": [
+            {
+                **cycle,
+                "time": datetime.fromtimestamp(cycle["time"], timezone.utc).isoformat(),
+                "duration": round(1000 * cycle["duration"], 1),
+            }
+            for cycle in inverter_coordinator.metrics.history
+        ],
+        "write_queue": {
+            "requested": inverter_coordinator.write_queue.requested,
+            "sent": inverter_coordinator.write_queue.sent,
+        },
+    }
@@ -0,0 +1,69 @@
+"""Energy flows between PV, battery, grid and home, derived from one poll."""
+from __future__ import annotations
+
+from collections import ChainMap
+from collections.abc import Mapping
+
+# Float registers the model is computed from
+PV_POWER = 100                 # Total DC power
+HOME_FROM_BATTERY = 106        # Home own consumption from battery
+HOME_FROM_GRID = 108           # Home own consumption from grid
+HOME_FROM_PV = 116             # Home own consumption from PV
+BATTERY_CURRENT = 200          # Actual battery charge (-) / discharge (+) current
+BATTERY_VOLTAGE = 216          # Battery voltage
+GRID_POWER = 252               # Total active power (powermeter), import (+) / export (-)
+
+ENERGY_FLOW_REGISTERS = (
+    PV_POWER,
+    HOME_FROM_BATTERY,
+    HOME_FROM_GRID,
+    HOME_FROM_PV,
+    BATTERY_CURRENT,
+    BATTERY_VOLTAGE,
+    GRID_POWER,
+)
+# Not polled while the inverter is idle, there is no PV then
+PV_REGISTERS = (PV_POWER, HOME_FROM_PV)
+
+
+def compute_energy_flow(values: Mapping[int, int | float | str | bool], idle: bool = False) -> dict[str, float]:
+    """Split the measured powers into flows between the sources and sinks.
+
+    The inverter reports the home consumption per source itself. PV that
+    does not go to the home charges the battery first, the rest is
+    exported; charging beyond that comes from the grid. All flows are
+    non-negative watts, the rates are percentages (None without load or
+    PV). Returns an empty dict until every register has been read. While
+    the inverter is idle the PV registers are not read and count as 0.
+    """
+    if idle:
+        values = ChainMap(dict.fromkeys(PV_REGISTERS, 0.0), values)
+    if any(not isinstance(values.get(address), (int, float)) for address in ENERGY_FLOW_REGISTERS):
+        return {}
+
+    pv = max(0.0, values[PV_POWER])
+    pv_to_home = max(0.0, values[HOME_FROM_PV])
+    battery_to_home = max(0.0, values[HOME_FROM_BATTERY])
+    grid_to_home = max(0.0, values[HOME_FROM_GRID])
+    # Discharging (+) / charging (-)
+    battery_power = values[BATTERY_CURRENT] * values[BATTERY_VOLTAGE]
+    grid_power = values[GRID_POWER]
+
+    charge = max(0.0, -battery_power)
+    pv_to_battery = min(charge, max(0.0, pv - pv_to_home))
+    grid_to_battery = min(charge - pv_to_battery, max(0.0, grid_power - grid_to_home))
+    pv_to_grid = min(max(0.0, -grid_power), max(0.0, pv - pv_to_home - pv_to_battery))
+    house_load = pv_to_home + battery_to_home + grid_to_home
+
+    return {
+        "pv_to_home": pv_to_home,
+        "pv_to_battery": pv_to_battery,
+        "pv_to_grid": pv_to_grid,
+        "grid_to_home": grid_to_home,
+        "grid_to_battery": grid_to_battery,
+        "battery_to_home": battery_to_home,
+        "battery_power": battery_power,
+        "house_load": house_load,
+        "self_sufficiency": 100 * (1 - grid_to_home / house_load) if house_load > 0 else None,
+        "self_consumption": 100 * (1 - pv_to_grid / pv) if pv > 0 else None,
+    }
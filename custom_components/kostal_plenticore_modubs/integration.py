@@ -0,0 +1,45 @@
+"""Energy counters integrated from power registers at the poll rate."""
+from __future__ import annotations
+
+# Reads further apart (seconds) are not integrated, the power in between is unknown
+INTEGRATION_MAX_GAP = 60.0
+
+
+class EnergyIntegrator:
+    """Trapezoidal integral of a power register in Wh, split by sign.
+
+    Positive power (import) and negative power (export) are accumulated
+    separately; a sign change between two reads is split at the zero
+    crossing. Timestamps are monotonic times of the reads, so the counters
+    do not depend on when entity states are written.
+    """
+
+    def __init__(self, imported: float = 0.0, exported: float = 0.0, max_gap: float = INTEGRATION_MAX_GAP):
+        self.imported = imported
+        self.exported = exported
+        self._max_gap = max_gap
+        self._last: tuple[float, float] | None = None
+
+    def add(self, power: float, now: float) -> None:
+        """Account for a read of power watts at monotonic time now."""
+        if self._last is not None:
+            last_time, last_power = self._last
+            elapsed = now - last_time
+            if 0 < elapsed <= self._max_gap:
+                self._integrate(last_power, power, elapsed)
+        self._last = (now, power)
+
+    def _integrate(self, start: float, end: float, elapsed: float) -> None:
+        if start * end < 0:
+            # Split at the zero crossing
+            crossing = elapsed * start / (start - end)
+            self._accumulate(start / 2 * crossing)
+            self._accumulate(end / 2 * (elapsed - crossing))
+        else:
+            self._accumulate((start + end) / 2 * elapsed)
+
+    def _accumulate(self, watt_seconds: float) -> None:
+        if watt_seconds > 0:
+            self.imported += watt_seconds / 3600
+        else:
+            self.exported -= watt_seconds / 3600
@@ -0,0 +1,70 @@
+"""Rolling Modbus health and poll performance metrics."""
+from __future__ import annotations
+
+from collections import deque
+import math
+import time
+
+# Block latencies kept for the percentiles
+LATENCY_SAMPLES = 200
+# Poll cycles kept for the diagnostics
+POLL_HISTORY = 50
+
+
+class RollingWindow:
+    """The most recent samples of a measurement, for percentiles in constant memory."""
+
+    def __init__(self, size: int = LATENCY_SAMPLES):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> float | None:
+        """Nearest-rank percentile of the samples, None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class PollMetrics:
+    """Durations of the poll cycles and the time of the last successful read.
+
+    The timings and errors of the last `history` cycles are kept as well.
+    """
+
+    def __init__(self, alpha: float = 0.1, history: int = POLL_HISTORY):
+        self._alpha = alpha
+        self.cycles = 0
+        self.last_cycle: float | None = None
+        self.average_cycle: float | None = None
+        self.last_success: float | None = None
+        self.history: deque[dict] = deque(maxlen=history)
+
+    def record_cycle(self, duration: float, success: bool, blocks: int = 0, errors: list[str] | None = None) -> None:
+        """Account for one poll cycle of duration seconds and the number of blocks it read."""
+        self.history.append({
+            "time": time.time(),
+            "duration": duration,
+            "blocks": blocks,
+            "errors": errors or [],
+        })
+        self.cycles += 1
+        self.last_cycle = duration
+        if self.average_cycle is None:
+            self.average_cycle = duration
+        else:
+            self.average_cycle += self._alpha * (duration - self.average_cycle)
+        if success:
+            self.last_success = time.monotonic()
+
+    def data_age(self) -> float | None:
+        """Seconds since registers were last read, None before the first read."""
+        if self.last_success is None:
+            return None
+        return time.monotonic() - self.last_success
@@ -29,10 +29,9 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the number inputs from a config entry."""
-    
-    ip_address = entry.data[CONF_IP_ADDRESS]
 
     inverter_coordinator = entry.runtime_data.inverter_coordinator
+    ip_address = inverter_coordinator.device_address
     async_add_entities([
         MinimumSocNumber(inverter_coordinator, ip_address),
         MaximumSocNumber(inverter_coordinator, ip_address),
@@ -53,7 +52,6 @@ class  KostalModbusNumber(CoordinatorEntity, NumberEntity):
         self._state = None
         self._name = name
         self._unique_id = f"{property_name}_number_{ip_address.replace('.', '_')}"
-        self._device_id = f"{NAME}_{ip_address.replace('.', '_')}"
         self._property_name = property_name
         self._modbus_address = modbus_address
         self._is_scaled = is_scaled
@@ -61,6 +59,7 @@ class  KostalModbusNumber(CoordinatorEntity, NumberEntity):
         self._attr_native_unit_of_measurement = unit        
         self._attr_native_min_value = min_value
         self._attr_native_step = step
+        self._optimistic_value = None
 
     @property
     def name(self):
@@ -73,25 +72,38 @@ class  KostalModbusNumber(CoordinatorEntity, NumberEntity):
     @property
     def device_info(self):
         """Get information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": NAME,
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-        }
+        return self.coordinator.device_info
 
     @property
     def scale_factor(self) -> float:
-        return 10 ** self.coordinator.read_float32(1025) if self._is_scaled else 1.0
+        return 10 ** (self.coordinator.value(1025) or 0) if self._is_scaled else 1.0
 
     @property
     def native_value(self):
-        return self.coordinator.read_float32(self._modbus_address) * self.scale_factor
+        if self._optimistic_value is not None:
+            return self._optimistic_value
+        value = self.coordinator.value(self._modbus_address)
+        return None if value is None else value * self.scale_factor
+
 
+    async def async_added_to_hass(self) -> None:
+        """Register the polled registers when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_register_span(self._modbus_address, 2, datatype="Float", read_back_callback=self._handle_read_back))
+        if self._is_scaled:
+            self.async_on_remove(self.coordinator.async_add_register_span(1025, 1, datatype="S16"))
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if self.coordinator.is_updated(self._modbus_address, 2):
+            self._optimistic_value = None
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_read_back(self) -> None:
+        """Show the value read back after writing the register."""
+        self._optimistic_value = None
         self.async_write_ha_state()
 
 
@@ -101,8 +113,21 @@ class  KostalModbusNumber(CoordinatorEntity, NumberEntity):
         await self.coordinator.async_request_refresh()
 
     async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
-        await self.coordinator.async_set_float_value(self._modbus_address, value)
+        """Update the current value.
+
+        The new value is shown optimistically until the coordinator has read
+        the register back after writing it, or the next poll has read it if
+        the read-back failed. It is reverted only if writing failed.
+        """
+        self._optimistic_value = value
+        self.async_write_ha_state()
+        written = False
+        try:
+            written = await self.coordinator.async_set_float_value(self._modbus_address, value)
+        finally:
+            if not written and self._optimistic_value == value:
+                self._optimistic_value = None
+                self.async_write_ha_state()
 
 
 
@@ -0,0 +1,204 @@
+"""Pipelined Modbus TCP transport and adaptive request pacing."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+_LOGGER = logging.getLogger(__name__)
+
+# The transport uses pymodbus' framer and PDU classes, which are internal and change
+# between minor releases; without them connections read serially
+try:
+    from pymodbus.framer import FramerSocket
+    from pymodbus.pdu import DecodePDU, ModbusPDU
+    from pymodbus.pdu.register_message import (
+        ReadHoldingRegistersRequest,
+        WriteMultipleRegistersRequest,
+    )
+except ImportError as e:
+    PIPELINE_SUPPORTED = False
+    _LOGGER.debug("Pipelining not supported by the installed pymodbus: %s", e)
+else:
+    PIPELINE_SUPPORTED = True
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Response times above CONGESTION_FACTOR x the fastest one mean the inverter queues requests
+CONGESTION_FACTOR = 2.0
+# Upper bound for the pause inserted between requests (seconds)
+MAX_PACING_DELAY = 0.5
+
+
+class AdaptivePacer:
+    """Derives request pacing from measured response times.
+
+    Keeps a smoothed response time next to the fastest one seen. While the
+    two stay close the inverter is not queueing: requests go out back to back
+    and the in-flight window grows by one per response. Once responses slow
+    down the window is halved and the excess latency is used as pause between
+    requests.
+    """
+
+    def __init__(self, max_window=DEFAULT_MAX_IN_FLIGHT, alpha=0.2):
+        self.max_window = max(1, max_window)
+        self.window = 1
+        self._alpha = alpha
+        self.smoothed_rtt: float | None = None
+        self.min_rtt: float | None = None
+
+    def record(self, rtt: float) -> None:
+        """Account for one measured response time in seconds."""
+        if self.smoothed_rtt is None:
+            self.smoothed_rtt = self.min_rtt = rtt
+        else:
+            self.smoothed_rtt += self._alpha * (rtt - self.smoothed_rtt)
+            # Let the baseline follow slowly so a permanently slower link is not punished forever
+            self.min_rtt = min(rtt, self.min_rtt + 0.01 * (rtt - self.min_rtt))
+
+        if self.congested:
+            self.window = max(1, self.window // 2)
+        else:
+            self.window = min(self.max_window, self.window + 1)
+
+    @property
+    def congested(self) -> bool:
+        return self.smoothed_rtt is not None and self.smoothed_rtt > CONGESTION_FACTOR * self.min_rtt
+
+    @property
+    def delay(self) -> float:
+        """Pause before the next request in seconds."""
+        if not self.congested:
+            return 0.0
+        return min(self.smoothed_rtt - self.min_rtt, MAX_PACING_DELAY)
+
+
+class ModbusTcpPipeline:
+    """Modbus TCP client keeping several transactions in flight on one socket.
+
+    Responses are matched to their requests by the MBAP transaction id, so
+    up to pacer.window requests are outstanding at once, sent at least
+    pacer.delay seconds apart. Offers the subset
+    of the AsyncModbusTcpClient API used by KostalModbusConnection.
+    """
+
+    def __init__(self, host, port, pacer: AdaptivePacer, timeout=3.0):
+        self._host = host
+        self._port = port
+        self._pacer = pacer
+        self._timeout = timeout
+        self._framer = FramerSocket(DecodePDU(False))
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._slot_free = asyncio.Condition()
+        self._next_tid = 0
+        # Monotonic time the next request may be sent at
+        self._send_at = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), self._timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("Connecting to %s:%s failed: %s", self._host, self._port, e)
+            return False
+        self._reader_task = asyncio.create_task(self._async_read_responses())
+        return True
+
+    def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ConnectionException("Connection closed"))
+
+    async def read_holding_registers(self, address: int, count: int, device_id: int) -> ModbusPDU:
+        return await self._async_execute(
+            ReadHoldingRegistersRequest(address=address, count=count, dev_id=device_id)
+        )
+
+    async def write_registers(self, address: int, values: list[int], device_id: int) -> ModbusPDU:
+        return await self._async_execute(
+            WriteMultipleRegistersRequest(address=address, registers=values, dev_id=device_id)
+        )
+
+    async def _async_execute(self, request: ModbusPDU) -> ModbusPDU:
+        if not self.connected:
+            raise ConnectionException("Not connected")
+
+        async with self._slot_free:
+            await self._slot_free.wait_for(lambda: not self.connected or len(self._pending) < self._pacer.window)
+            # Another request may have timed out and closed the connection meanwhile
+            writer = self._writer
+            if writer is None or writer.is_closing():
+                raise ConnectionException("Connection closed while waiting for a slot")
+            self._next_tid = self._next_tid % 0xFFFF + 1
+            request.transaction_id = self._next_tid
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request.transaction_id] = future
+            # Release the requests one pacing interval apart
+            send_at = max(time.monotonic(), self._send_at)
+            self._send_at = send_at + self._pacer.delay
+
+        try:
+            if (delay := send_at - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+                writer = self._writer
+                if writer is None or writer.is_closing():
+                    raise ConnectionException("Connection closed while pacing")
+            started = time.monotonic()
+            try:
+                writer.write(self._framer.buildFrame(request))
+            except (OSError, RuntimeError) as e:
+                self.close()
+                raise ConnectionException(f"Sending {request} failed: {e}") from e
+            response = await asyncio.wait_for(future, self._timeout)
+            self._pacer.record(time.monotonic() - started)
+            return response
+        except asyncio.TimeoutError as e:
+            # A lost response leaves the stream in an unknown state
+            self.close()
+            raise ModbusIOException(f"No response to {request}") from e
+        finally:
+            async with self._slot_free:
+                self._pending.pop(request.transaction_id, None)
+                self._slot_free.notify_all()
+
+    async def _async_read_responses(self) -> None:
+        buffer = b""
+        try:
+            while True:
+                data = await self._reader.read(4096)
+                if not data:
+                    raise ConnectionException("Connection closed by peer")
+                buffer += data
+                while buffer:
+                    used, pdu = self._framer.handleFrame(buffer, 0, 0)
+                    buffer = buffer[used:]
+                    if pdu is None:
+                        break
+                    future = self._pending.get(pdu.transaction_id)
+                    if future is not None and not future.done():
+                        future.set_result(pdu)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            self._fail_pending(e if isinstance(e, ConnectionException) else ModbusIOException(str(e)))
+            if self._writer is not None:
+                self._writer.close()
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
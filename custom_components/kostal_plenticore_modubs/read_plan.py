@@ -0,0 +1,35 @@
+"""Block read planning for the Modbus poll."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+# Modbus limits a single "read holding registers" request to 125 registers
+MAX_REGISTERS_PER_READ = 125
+
+# Unused registers that may be read to merge two neighbouring blocks
+DEFAULT_MAX_GAP = 16
+
+
+def build_read_plan(
+    spans: Iterable[tuple[int, int]],
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_REGISTERS_PER_READ,
+) -> list[tuple[int, int]]:
+    """Merge (address, count) spans into the fewest block reads.
+
+    Spans are processed in address order. A span is appended to the current
+    block if it starts at most max_gap registers after the block's end and
+    the block does not grow beyond max_count registers.
+    """
+    blocks: list[list[int]] = []
+
+    for address, count in sorted(set(spans)):
+        end = address + count
+        if blocks:
+            block = blocks[-1]
+            if address - block[1] <= max_gap and max(end, block[1]) - block[0] <= max_count:
+                block[1] = max(end, block[1])
+                continue
+        blocks.append([address, end])
+
+    return [(start, end - start) for start, end in blocks]
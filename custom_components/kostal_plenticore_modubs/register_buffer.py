@@ -0,0 +1,76 @@
+"""Register words of the polled address ranges."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+
+
+class RegisterBuffer:
+    """Sparse register store, updated in place on every poll.
+
+    The buffer consists of one preallocated array('H') segment per address
+    range (extent) that is polled, so far apart ranges such as the SunSpec
+    area above 40000 do not require one huge allocation. Every block read
+    lies inside one segment and can be handed out as a memoryview.
+    """
+
+    def __init__(self):
+        self._starts: list[int] = []
+        self._segments: list[array] = []
+
+    def layout(self, extents: Iterable[tuple[int, int]]) -> None:
+        """Allocate the segments for (address, count) extents, keeping known words."""
+        starts = []
+        segments = []
+        for address, count in sorted(extents):
+            segment = array("H", bytes(2 * count))
+            for index, start in enumerate(self._starts):
+                old = self._segments[index]
+                low = max(address, start)
+                high = min(address + count, start + len(old))
+                if low < high:
+                    segment[low - address:high - address] = old[low - start:high - start]
+            starts.append(address)
+            segments.append(segment)
+        self._starts = starts
+        self._segments = segments
+
+    @property
+    def extents(self) -> list[tuple[int, int]]:
+        return [(start, len(segment)) for start, segment in zip(self._starts, self._segments)]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(segment) * segment.itemsize for segment in self._segments)
+
+    def _locate(self, address: int, count: int) -> tuple[array, int]:
+        index = bisect_right(self._starts, address) - 1
+        if index >= 0:
+            segment = self._segments[index]
+            offset = address - self._starts[index]
+            if offset + count <= len(segment):
+                return segment, offset
+        raise KeyError(f"Registers {address}..{address + count - 1} are not buffered")
+
+    def update(self, address: int, words: Sequence[int]) -> memoryview:
+        """Store words read from address and return a view of them."""
+        segment, offset = self._locate(address, len(words))
+        segment[offset:offset + len(words)] = array("H", words)
+        return memoryview(segment)[offset:offset + len(words)]
+
+    def view(self, address: int, count: int) -> memoryview:
+        """Read-only view of count words from address."""
+        segment, offset = self._locate(address, count)
+        return memoryview(segment)[offset:offset + count].toreadonly()
+
+    def __contains__(self, address: int) -> bool:
+        try:
+            self._locate(address, 1)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, address: int) -> int:
+        segment, offset = self._locate(address, 1)
+        return segment[offset]
@@ -0,0 +1,56 @@
+"""Aggregation of registers sampled faster than their states are written."""
+from __future__ import annotations
+
+from array import array
+import math
+
+
+class SampleWindow:
+    """Samples of one register during a publishing window.
+
+    The samples go into a preallocated ring buffer sized for two windows,
+    so a late window close never allocates; beyond that the oldest samples
+    are overwritten. Closing the window aggregates the samples into mean,
+    min, max and last and starts the next window with the next sample.
+    """
+
+    def __init__(self, window: float, interval: float):
+        self.window = window
+        self._size = 2 * max(1, math.ceil(window / interval))
+        self._samples = array("d", bytes(8 * self._size))
+        self._count = 0
+        self._last: float | None = None
+        self.started: float | None = None
+        self.aggregate: dict[str, float | int] | None = None
+
+    def add(self, value: float, now: float) -> None:
+        if self.started is None:
+            self.started = now
+        self._samples[self._count % self._size] = value
+        self._count += 1
+        self._last = value
+
+    def due(self, now: float) -> bool:
+        """Whether the window started at least `window` seconds before now."""
+        return self.started is not None and now - self.started >= self.window
+
+    def close(self) -> dict[str, float | int]:
+        """Aggregate the samples of the window and start the next one."""
+        samples = self._samples[:min(self._count, self._size)]
+        self.aggregate = {
+            "mean": math.fsum(samples) / len(samples),
+            "min": min(samples),
+            "max": max(samples),
+            "last": self._last,
+            "samples": self._count,
+        }
+        self._count = 0
+        self.started = None
+        return self.aggregate
+
+    def reset(self) -> None:
+        """Drop the samples and the last aggregate, the register is not read anymore."""
+        self._count = 0
+        self._last = None
+        self.started = None
+        self.aggregate = None
@@ -1,8 +1,9 @@
 import logging
+import time
 
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity import Entity, EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower, UnitOfTime
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -24,7 +25,21 @@ from .const import (
     CONF_IP_ADDRESS,
     MANUFACTURER,
     MODEL,
-    NAME
+    NAME,
+    IDENTITY_REGISTERS,
+    POLL_TIER_NORMAL,
+    POLL_TIER_ONCE,
+    POLL_TIER_INTERVALS,
+    POLL_TIER_SLOW
+)
+
+from .catalog import (
+    CATALOG
+)
+
+from .energy_flow import (
+    ENERGY_FLOW_REGISTERS,
+    PV_REGISTERS
 )
 
 from .register_info import (
@@ -34,13 +49,73 @@ from .register_info import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Modbus health and poll performance: (statistics key, unique id, name, icon, device class, unit, precision, state class, deadband)
+# Without deadband a changed value is written at most once per normal tier interval, counters are written on every change
+DIAGNOSTIC_SENSORS = [
+    ("last_cycle_duration", "modbus_last_cycle_duration", "Modbus last poll duration", "mdi:timer-outline", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS, 0, SensorStateClass.MEASUREMENT, None),
+    ("average_cycle_duration", "modbus_average_cycle_duration", "Modbus average poll duration", "mdi:timer-outline", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS, 0, SensorStateClass.MEASUREMENT, None),
+    ("block_latency_p50", "modbus_block_latency_p50", "Modbus block latency p50", "mdi:timer-sand", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS, 0, SensorStateClass.MEASUREMENT, None),
+    ("block_latency_p95", "modbus_block_latency_p95", "Modbus block latency p95", "mdi:timer-sand", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS, 0, SensorStateClass.MEASUREMENT, None),
+    ("block_latency_p99", "modbus_block_latency_p99", "Modbus block latency p99", "mdi:timer-sand", SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS, 0, SensorStateClass.MEASUREMENT, None),
+    ("timeouts", "modbus_timeouts", "Modbus timeouts", "mdi:timer-alert-outline", None, None, 0, SensorStateClass.TOTAL_INCREASING, 0),
+    ("exception_responses", "modbus_exception_responses", "Modbus exception responses", "mdi:alert-circle-outline", None, None, 0, SensorStateClass.TOTAL_INCREASING, 0),
+    ("reconnects", "modbus_reconnects", "Modbus reconnects", "mdi:lan-connect", None, None, 0, SensorStateClass.TOTAL_INCREASING, 0),
+    ("connect_failures", "modbus_connect_failures", "Modbus connect failures", "mdi:lan-disconnect", None, None, 0, SensorStateClass.TOTAL_INCREASING, 0),
+    ("data_age", "modbus_data_age", "Modbus data age", "mdi:clock-outline", SensorDeviceClass.DURATION, UnitOfTime.SECONDS, 0, SensorStateClass.MEASUREMENT, None),
+]
+
+# Power flows computed by the coordinator: (energy flow key, unique id, name, icon, device class, unit, precision, state class)
+ENERGY_FLOW_SENSORS = [
+    ("pv_to_home", "energy_flow_pv_to_home", "PV to home power", "mdi:solar-power", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("pv_to_battery", "energy_flow_pv_to_battery", "PV to battery power", "mdi:solar-power", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("pv_to_grid", "energy_flow_pv_to_grid", "PV to grid power", "mdi:transmission-tower-export", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("grid_to_home", "energy_flow_grid_to_home", "Grid to home power", "mdi:transmission-tower-import", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("grid_to_battery", "energy_flow_grid_to_battery", "Grid to battery power", "mdi:transmission-tower-import", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("battery_to_home", "energy_flow_battery_to_home", "Battery to home power", "mdi:home-battery", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("battery_power", "energy_flow_battery_power", "Battery discharge power", "mdi:battery-charging", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("house_load", "energy_flow_house_load", "House load", "mdi:home-lightning-bolt", SensorDeviceClass.POWER, UnitOfPower.WATT, 0, SensorStateClass.MEASUREMENT),
+    ("self_sufficiency", "energy_flow_self_sufficiency", "Self-sufficiency", "mdi:home-percent", None, PERCENTAGE, 0, SensorStateClass.MEASUREMENT),
+    ("self_consumption", "energy_flow_self_consumption", "Self-consumption rate", "mdi:solar-power-variant", None, PERCENTAGE, 0, SensorStateClass.MEASUREMENT),
+]
+
+# Energy integrated by the coordinator from power registers: (register, direction, unique id, name, icon, enabled by default)
+ENERGY_INTEGRATION_SENSORS = [
+    (252, "imported", "grid_import_energy", "Grid import energy", "mdi:transmission-tower-import", True),
+    (252, "exported", "grid_export_energy", "Grid export energy", "mdi:transmission-tower-export", True),
+    (224, "imported", "grid_import_energy_phase_1", "Grid import energy phase 1", "mdi:transmission-tower-import", False),
+    (224, "exported", "grid_export_energy_phase_1", "Grid export energy phase 1", "mdi:transmission-tower-export", False),
+    (234, "imported", "grid_import_energy_phase_2", "Grid import energy phase 2", "mdi:transmission-tower-import", False),
+    (234, "exported", "grid_export_energy_phase_2", "Grid export energy phase 2", "mdi:transmission-tower-export", False),
+    (244, "imported", "grid_import_energy_phase_3", "Grid import energy phase 3", "mdi:transmission-tower-import", False),
+    (244, "exported", "grid_export_energy_phase_3", "Grid export energy phase 3", "mdi:transmission-tower-export", False),
+]
+# Wh an integrated counter has to grow by before its state is written (or after max_age seconds)
+ENERGY_INTEGRATION_DEADBAND = 10
+ENERGY_INTEGRATION_MAX_AGE = 300
+
+# Device class, state class and Home Assistant unit of catalog registers by documented unit
+CATALOG_UNITS = {
+    "W": (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "W"),
+    "Wh": (SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "Wh"),
+    "VA": (SensorDeviceClass.APPARENT_POWER, SensorStateClass.MEASUREMENT, "VA"),
+    "Var": (SensorDeviceClass.REACTIVE_POWER, SensorStateClass.MEASUREMENT, "var"),
+    "A": (SensorDeviceClass.CURRENT, SensorStateClass.MEASUREMENT, "A"),
+    "V": (SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, "V"),
+    "Hz": (SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT, "Hz"),
+    "°C": (SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, "°C"),
+    "s": (SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, "s"),
+    "%": (None, SensorStateClass.MEASUREMENT, PERCENTAGE),
+    "Ah": (None, SensorStateClass.MEASUREMENT, "Ah"),
+    "Ohm": (None, SensorStateClass.MEASUREMENT, "Ω"),
+}
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the EEVE Mower battery sensor from a config entry."""
     _LOGGER.info("async_setup_entry")
-    ip_address = entry.data[CONF_IP_ADDRESS]
 
     #Add mowing info sensors
     inverter_coordinator = entry.runtime_data.inverter_coordinator
+    ip_address = inverter_coordinator.device_address
     sensors = []
     # sensors = [
     #     InverterStateSensor(inverter_coordinator, ip_address, 56),
@@ -61,14 +136,56 @@ async def async_setup_entry(hass, entry, async_add_entities):
     #     ]
 
     for ri in REGISTERS:
+        sampled = ri.sampled and inverter_coordinator.sample_window is not None
         match ri.type:
-            case "U16":
-                sensors.append(KostalUInt16Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class))
+            case "U16" | "U8":
+                sensors.append(KostalUInt16Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, sampled))
+            case "S16" | "S8":
+                sensors.append(KostalInt16Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, sampled))
+            case "U32":
+                sensors.append(KostalUInt32Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, sampled))
+            case "S32":
+                sensors.append(KostalInt32Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, sampled))
             case "Float":
-                sensors.append(KostalFloat32Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class))
+                sensors.append(KostalFloat32Sensor(inverter_coordinator, ip_address, ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision, ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, sampled))
+
+    # Every other documented register, disabled until the user enables it (identity registers are in the device info)
+    known = {ri.address for ri in REGISTERS} | {address for address, _ in IDENTITY_REGISTERS.values()}
+    for register in CATALOG:
+        if register.readable and register.address not in known:
+            sensors.append(catalog_sensor(inverter_coordinator, ip_address, register))
+
+    for key, unique_id, name, icon, device_class, unit, precision, state_class in ENERGY_FLOW_SENSORS:
+        sensors.append(EnergyFlowSensor(inverter_coordinator, ip_address, key, unique_id, name, icon, device_class, unit, precision, state_class))
+
+    for address, direction, unique_id, name, icon, enabled_default in ENERGY_INTEGRATION_SENSORS:
+        sensors.append(EnergyIntegrationSensor(inverter_coordinator, ip_address, address, direction, unique_id, name, icon, enabled_default))
+
+    for key, unique_id, name, icon, device_class, unit, precision, state_class, deadband in DIAGNOSTIC_SENSORS:
+        sensors.append(ModbusDiagnosticSensor(inverter_coordinator, ip_address, key, unique_id, name, icon, device_class, unit, precision, state_class, deadband))
 
     async_add_entities(sensors)
 
+def catalog_sensor(coordinator, ip_address, register):
+    """Disabled by default sensor for a register of the catalog."""
+    device_class, state_class, unit = CATALOG_UNITS.get(register.unit, (None, None, register.unit))
+    unique_id = f"register_{register.address}"
+    if register.datatype == "String":
+        return KostalStringSensor(
+            coordinator, ip_address, register.address, unique_id, register.description, None, None, None, None, None, POLL_TIER_ONCE,
+            register_count=register.count, enabled_default=False, entity_category=EntityCategory.DIAGNOSTIC,
+        )
+    sensor_class = CATALOG_SENSOR_CLASSES[register.datatype]
+    poll_tier = POLL_TIER_SLOW if device_class == SensorDeviceClass.ENERGY else POLL_TIER_NORMAL
+    if "capacity" in register.description.lower():
+        # Not a counter
+        state_class = None
+    precision = 1 if register.datatype == "Float" else None
+    return sensor_class(
+        coordinator, ip_address, register.address, unique_id, register.description, None, device_class, unit, precision, state_class, poll_tier,
+        register_count=register.count, enabled_default=False,
+    )
+
 class KostalSensor(CoordinatorEntity, SensorEntity):
     """ Kostal sensor."""
     
@@ -76,21 +193,37 @@ class KostalSensor(CoordinatorEntity, SensorEntity):
     _attr_device_class = None
     _attr_native_unit_of_measurement = None
     _attr_suggested_display_precision = None
+    _register_count = 1
+    _datatype = "U16"
 
-    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT):
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
         super().__init__(coordinator, context=0)
 
         self._register_address = register_address
+        if register_count is not None:
+            # Registers documented longer than the datatype
+            self._register_count = register_count
+        self._poll_tier = poll_tier
+        self._deadband = deadband
+        self._relative_deadband = relative_deadband
+        self._max_age = max_age
+        self._shed_when_idle = shed_when_idle
+        self._sampled = sampled
+        self._written_state = None
+        self._written_available = None
+        self._written_restored = None
+        self._written_at = 0.0
 
         self._name = name
         self._unique_id = f"{unique_id}_{ip_address.replace('.', '_')}"
-        self._device_id = f"{NAME}_{ip_address.replace('.', '_')}"
 
         self._attr_icon = icon
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = native_unit_of_measurement
         self._attr_suggested_display_precision = suggested_display_precision
         self._attr_state_class = sensor_state_class
+        self._attr_entity_registry_enabled_default = enabled_default
+        self._attr_entity_category = entity_category
 
     @property
     def name(self):
@@ -103,17 +236,89 @@ class KostalSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         """Get information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": NAME,
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-        }
+        return self.coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register the polled registers when added to hass."""
+        await super().async_added_to_hass()
+        if self._sampled:
+            self.async_on_remove(
+                self.coordinator.async_add_sampled_register(self._register_address, self._register_count, self._datatype, self._shed_when_idle)
+            )
+        else:
+            self.async_on_remove(
+                self.coordinator.async_add_register_span(
+                    self._register_address, self._register_count, self._poll_tier, self._datatype, self._shed_when_idle, self._handle_read_back
+                )
+            )
+
+    @property
+    def state(self):
+        if self._sampled:
+            if self._shed_when_idle and self.coordinator.idle:
+                # Not sampled while the inverter is idle, unknown rather than the mean of an old window
+                return None
+            if (window := self.coordinator.window(self._register_address)) is not None:
+                return window["mean"]
+        return self.coordinator.value(self._register_address)
+
+    @property
+    def extra_state_attributes(self):
+        """Mark values restored from the snapshot of the last run, min, max and last of sampled registers."""
+        attributes = {}
+        if self.coordinator.restored:
+            attributes["restored"] = True
+        if self._sampled and (window := self.coordinator.window(self._register_address)) is not None:
+            attributes.update({key: window[key] for key in ("min", "max", "last", "samples")})
+        return attributes or None
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        if self._sampled:
+            # One state per sample window, whatever it changed
+            if self.coordinator.is_window_closed(self._register_address) or (self.available, self.coordinator.restored) != (self._written_available, self._written_restored):
+                self._written_available = self.available
+                self._written_restored = self.coordinator.restored
+                self.async_write_ha_state()
+        elif self.coordinator.is_updated(self._register_address, self._register_count) and self._is_significant():
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_read_back(self) -> None:
+        """Handle the register read back after a write."""
+        if self._is_significant():
+            self.async_write_ha_state()
+
+    def _is_significant(self) -> bool:
+        """Whether the state moved beyond the deadband or max_age has passed."""
+        state = self.state
+        available = self.available
+        restored = self.coordinator.restored
+        now = time.monotonic()
+        last = self._written_state
+
+        if restored != self._written_restored:
+            significant = True
+        elif available != self._written_available or last is None or state is None:
+            significant = available != self._written_available or state != last
+        elif self._max_age is not None and now - self._written_at >= self._max_age:
+            significant = True
+        elif isinstance(state, (int, float)) and isinstance(last, (int, float)):
+            threshold = max(
+                self._deadband or 0,
+                abs(last) * self._relative_deadband if self._relative_deadband else 0,
+            )
+            significant = abs(state - last) > threshold if threshold else state != last
+        else:
+            significant = state != last
+
+        if significant:
+            self._written_state = state
+            self._written_available = available
+            self._written_restored = restored
+            self._written_at = now
+        return significant
 
 
     async def async_update(self):
@@ -123,34 +328,79 @@ class KostalSensor(CoordinatorEntity, SensorEntity):
 class KostalFloat32Sensor(KostalSensor):
     """ Kostal FLOAT32 sensor."""
 
-    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT):
-        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class)
+    _register_count = 2
+    _datatype = "Float"
 
-    @property
-    def state(self):
-        return self.coordinator.read_float32(self._register_address)
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
 
 
 class KostalInt16Sensor(KostalSensor):
     """ Kostal INT16 sensor."""
 
-    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT):
-        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class)
+    _datatype = "S16"
 
-    @property
-    def state(self):
-        return self.coordinator.read_int16(self._register_address)
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
 
 
 class KostalUInt16Sensor(KostalSensor):
     """ Kostal UINT16 sensor."""
 
-    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT):
-        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class)
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
+
+
+class KostalUInt32Sensor(KostalSensor):
+    """ Kostal UINT32 sensor."""
+
+    _register_count = 2
+    _datatype = "U32"
+
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
+
+
+class KostalInt32Sensor(KostalSensor):
+    """ Kostal INT32 sensor."""
+
+    _register_count = 2
+    _datatype = "S32"
+
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
+
+
+class KostalBoolSensor(KostalSensor):
+    """ Kostal BOOL sensor."""
+
+    _datatype = "Bool"
+
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = SensorStateClass.MEASUREMENT, poll_tier = POLL_TIER_NORMAL, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = None, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
+
+
+class KostalStringSensor(KostalSensor):
+    """ Kostal STRING sensor, register_count registers long."""
+
+    _datatype = "String"
+
+    def __init__(self, coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class = None, poll_tier = POLL_TIER_ONCE, deadband = None, relative_deadband = None, max_age = None, shed_when_idle = False, sampled = False, register_count = 8, enabled_default = True, entity_category = None):
+        super().__init__(coordinator, ip_address, register_address, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, poll_tier, deadband, relative_deadband, max_age, shed_when_idle, sampled, register_count, enabled_default, entity_category)
+
+
+# Sensor class of catalog registers by datatype (strings need their length)
+CATALOG_SENSOR_CLASSES = {
+    "U8": KostalUInt16Sensor,
+    "U16": KostalUInt16Sensor,
+    "S8": KostalInt16Sensor,
+    "S16": KostalInt16Sensor,
+    "U32": KostalUInt32Sensor,
+    "S32": KostalInt32Sensor,
+    "Bool": KostalBoolSensor,
+    "Float": KostalFloat32Sensor,
+}
 
-    @property
-    def state(self):
-        return self.coordinator.read_uint16(self._register_address)
 
 # class BatteryWorkCapacitySensor(KostalFloat32Sensor):
 #     """Battery work capacity sensor."""
@@ -248,7 +498,6 @@ class InverterStateSensor(CoordinatorEntity, SensorEntity):
 
         self._name = f"Inverter State"
         self._unique_id = f"inverter_state_sensor_{ip_address.replace('.', '_')}"
-        self._device_id = f"{NAME}_{ip_address.replace('.', '_')}"
 
     @property
     def name(self):
@@ -261,23 +510,21 @@ class InverterStateSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         """Get information about this device."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": NAME,
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-        }
+        return self.coordinator.device_info
 
     @property
     def state(self):
         inverter_state = self.coordinator.data["inverter_state"]
+        if not 0 <= inverter_state < len(self._options_enum):
+            inverter_state = len(self._options_enum) - 1
         return self._options_enum[inverter_state]
 
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        if self.coordinator.is_updated(self._register_address, 2):
+            self.async_write_ha_state()
 
 
     async def async_update(self):
@@ -286,4 +533,182 @@ class InverterStateSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def options(self):
-        return list(self._options_enum)
\ No newline at end of file
+        return list(self._options_enum)
+
+
+class ModbusDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Modbus health / poll performance sensor."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, ip_address, key, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class, deadband = None):
+        super().__init__(coordinator, context=0)
+
+        self._key = key
+        self._deadband = deadband
+        self._written_state = None
+        self._written_at = None
+
+        self._name = name
+        self._unique_id = f"{unique_id}_{ip_address.replace('.', '_')}"
+
+        self._attr_icon = icon
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = native_unit_of_measurement
+        self._attr_suggested_display_precision = suggested_display_precision
+        self._attr_state_class = sensor_state_class
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+    @property
+    def device_info(self):
+        """Get information about this device."""
+        return self.coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Diagnostics stay available while the inverter is unreachable."""
+        return True
+
+    @property
+    def native_value(self):
+        return self.coordinator.statistics[self._key]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state when it moved beyond the deadband, otherwise once per normal tier interval."""
+        state = self.native_value
+        last = self._written_state
+        now = time.monotonic()
+        if state == last and self._written_at is not None:
+            return
+        if self._written_at is None or now - self._written_at >= POLL_TIER_INTERVALS[POLL_TIER_NORMAL]:
+            significant = True
+        elif self._deadband is not None and state is not None and last is not None:
+            significant = abs(state - last) > self._deadband
+        else:
+            significant = False
+        if significant:
+            self._written_state = state
+            self._written_at = now
+            self.async_write_ha_state()
+
+
+class EnergyFlowSensor(CoordinatorEntity, SensorEntity):
+    """Power flow derived by the coordinator from the registers of one poll."""
+
+    def __init__(self, coordinator, ip_address, key, unique_id, name, icon, device_class, native_unit_of_measurement, suggested_display_precision, sensor_state_class):
+        super().__init__(coordinator, context=0)
+
+        self._key = key
+        self._written = None
+
+        self._name = name
+        self._unique_id = f"{unique_id}_{ip_address.replace('.', '_')}"
+
+        self._attr_icon = icon
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = native_unit_of_measurement
+        self._attr_suggested_display_precision = suggested_display_precision
+        self._attr_state_class = sensor_state_class
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+    @property
+    def device_info(self):
+        """Get information about this device."""
+        return self.coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register the registers of the energy flow model when added to hass."""
+        await super().async_added_to_hass()
+        for address in ENERGY_FLOW_REGISTERS:
+            self.async_on_remove(
+                self.coordinator.async_add_register_span(address, 2, datatype="Float", shed_when_idle=address in PV_REGISTERS)
+            )
+
+    @property
+    def native_value(self):
+        return self.coordinator.energy_flow.get(self._key)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when it changed."""
+        written = (self.available, self.native_value)
+        if written != self._written:
+            self._written = written
+            self.async_write_ha_state()
+
+
+class EnergyIntegrationSensor(CoordinatorEntity, SensorEntity):
+    """Import or export energy the coordinator integrates from a power register."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, coordinator, ip_address, register_address, direction, unique_id, name, icon, enabled_default):
+        super().__init__(coordinator, context=0)
+
+        self._register_address = register_address
+        self._direction = direction
+        self._written = None
+        self._written_at = 0.0
+
+        self._name = name
+        self._unique_id = f"{unique_id}_{ip_address.replace('.', '_')}"
+
+        self._attr_icon = icon
+        self._attr_entity_registry_enabled_default = enabled_default
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+    @property
+    def device_info(self):
+        """Get information about this device."""
+        return self.coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Integrate the power register when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_integrated_register(self._register_address))
+
+    @property
+    def native_value(self):
+        integrator = self.coordinator.integrator(self._register_address)
+        return None if integrator is None else getattr(integrator, self._direction)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state once the counter grew by the deadband or max_age has passed."""
+        value = self.native_value
+        now = time.monotonic()
+        written = self._written
+        if (
+            written is None
+            or self.available != written[0]
+            or (value is not None and (written[1] is None or value - written[1] >= ENERGY_INTEGRATION_DEADBAND))
+            or (value != written[1] and now - self._written_at >= ENERGY_INTEGRATION_MAX_AGE)
+        ):
+            self._written = (self.available, value)
+            self._written_at = now
+            self.async_write_ha_state()
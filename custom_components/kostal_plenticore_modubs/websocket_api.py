@@ -0,0 +1,160 @@
+"""Websocket API streaming the decoded registers of every poll."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+# Sections of a snapshot message
+FIELD_VALUES = "values"
+FIELD_ENERGY_FLOW = "energy_flow"
+FIELD_ENERGY = "energy"
+FIELD_WINDOWS = "windows"
+FIELDS = (FIELD_VALUES, FIELD_ENERGY_FLOW, FIELD_ENERGY, FIELD_WINDOWS)
+
+# hass.data key of the active subscriptions by config entry id
+DATA_SUBSCRIPTIONS = f"{DOMAIN}_subscriptions"
+# Error code of subscriptions ended by unloading their config entry
+ERR_ENTRY_UNLOADED = "entry_unloaded"
+
+_MISSING = object()
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@callback
+def _async_entry_subscriptions(hass: HomeAssistant, entry) -> dict[SnapshotSubscription, Callable[[], None]]:
+    """Active subscriptions of a config entry and the callbacks ending them, ended on unload."""
+    subscriptions = hass.data.setdefault(DATA_SUBSCRIPTIONS, {})
+    if entry.entry_id not in subscriptions:
+        subscriptions[entry.entry_id] = {}
+
+        @callback
+        def async_end_subscriptions() -> None:
+            for end_subscription in list(subscriptions.pop(entry.entry_id, {}).values()):
+                end_subscription()
+
+        entry.async_on_unload(async_end_subscriptions)
+    return subscriptions[entry.entry_id]
+
+
+class SnapshotSubscription:
+    """What one subscriber has been sent, to send it only the changes.
+
+    The first message holds the complete snapshot, later ones the values
+    that changed since the previous message. Messages are sent at most
+    every min_interval seconds; changes in between are merged into the
+    next message.
+    """
+
+    def __init__(self, coordinator, registers: list[int] | None, fields: list[str], min_interval: float):
+        self._coordinator = coordinator
+        self._registers = None if registers is None else frozenset(registers)
+        self._min_interval = min_interval
+        self._sent: dict[str, dict] = {field: {} for field in fields}
+        self._sent_at = -float("inf")
+        self._available: bool | None = None
+
+    def _by_register(self, items) -> dict[int, Any]:
+        return {address: value for address, value in items if self._registers is None or address in self._registers}
+
+    def _current(self, field: str) -> dict:
+        coordinator = self._coordinator
+        if field == FIELD_VALUES:
+            return self._by_register(((coordinator.data or {}).get("values") or {}).items())
+        if field == FIELD_ENERGY_FLOW:
+            return coordinator.energy_flow
+        if field == FIELD_ENERGY:
+            return self._by_register(
+                (address, [integrator.imported, integrator.exported])
+                for address in coordinator.integrated_registers
+                if (integrator := coordinator.integrator(address)) is not None
+            )
+        return self._by_register((address, coordinator.window(address)) for address in coordinator.sampled_registers)
+
+    def message(self, now: float) -> dict[str, Any] | None:
+        """Changes since the last message, None if there are none or it is too early."""
+        if now - self._sent_at < self._min_interval:
+            return None
+
+        message: dict[str, Any] = {}
+        available = self._coordinator.last_update_success
+        if available != self._available:
+            message["available"] = available
+        for field, sent in self._sent.items():
+            changed = {key: value for key, value in self._current(field).items() if sent.get(key, _MISSING) != value}
+            if changed:
+                sent.update(changed)
+                message[field] = changed
+        if not message:
+            return None
+
+        self._available = available
+        self._sent_at = now
+        message["time"] = time.time()
+        return message
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("registers"): [vol.Coerce(int)],
+        vol.Optional("fields", default=list(FIELDS)): [vol.In(FIELDS)],
+        vol.Optional("min_interval", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+@callback
+def websocket_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Send the changed registers of an inverter after every poll.
+
+    Optional: registers limits the values, sample windows and energy
+    counters to these addresses, fields selects the sections of the
+    messages and min_interval is the least number of seconds between two
+    messages. Unloading the config entry ends the subscription with an
+    entry_unloaded error.
+    """
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if entry is None or entry.domain != DOMAIN or getattr(entry, "runtime_data", None) is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found or not loaded")
+        return
+
+    coordinator = entry.runtime_data.inverter_coordinator
+    subscription = SnapshotSubscription(coordinator, msg.get("registers"), msg["fields"], msg["min_interval"])
+
+    @callback
+    def forward_snapshot() -> None:
+        if (message := subscription.message(time.monotonic())) is not None:
+            connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    remove_listener = coordinator.async_add_listener(forward_snapshot)
+    entry_subscriptions = _async_entry_subscriptions(hass, entry)
+
+    @callback
+    def unsubscribe() -> None:
+        remove_listener()
+        entry_subscriptions.pop(subscription, None)
+
+    @callback
+    def end_subscription() -> None:
+        """The coordinator is shut down, tell the subscriber instead of going silent."""
+        remove_listener()
+        if connection.subscriptions.get(msg["id"]) is unsubscribe:
+            del connection.subscriptions[msg["id"]]
+        connection.send_error(msg["id"], ERR_ENTRY_UNLOADED, "Config entry unloaded")
+
+    entry_subscriptions[subscription] = end_subscription
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    forward_snapshot()
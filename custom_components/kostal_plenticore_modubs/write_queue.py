@@ -0,0 +1,104 @@
+"""Debounced, merged register writes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to collect writes before sending them
+DEFAULT_WRITE_DELAY = 0.3
+
+
+def merge_writes(writes: dict[int, list[int]]) -> list[tuple[int, list[int]]]:
+    """Merge {address: words} into (address, words) blocks of adjacent registers."""
+    blocks: list[tuple[int, list[int]]] = []
+    for address, words in sorted(writes.items()):
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == address:
+            blocks[-1][1].extend(words)
+        else:
+            blocks.append((address, list(words)))
+    return blocks
+
+
+class WriteQueue:
+    """Collects register writes and sends them in as few requests as possible.
+
+    The first write starts a window of `delay` seconds. Within the window a
+    newer value for an address replaces the pending one, then the pending
+    writes are merged into blocks of adjacent registers and handed to
+    write_block one by one. Every caller gets a future that resolves once
+    its value, or a newer value for the same address, has been committed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write_block: Callable[[int, list[int]], Awaitable[None]],
+        delay: float = DEFAULT_WRITE_DELAY,
+    ):
+        self._hass = hass
+        self._write_block = write_block
+        self._delay = delay
+        self._pending: dict[int, list[int]] = {}
+        self._futures: dict[int, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.requested = 0
+        self.sent = 0
+
+    @callback
+    def async_write(self, address: int, words: list[int]) -> asyncio.Future:
+        """Queue a write, returns a future resolved when it is committed."""
+        if address in self._pending and len(self._pending[address]) != len(words):
+            # A different width at the same address cannot replace the old value, send that one first
+            self._hass.async_create_task(
+                self._async_send({address: self._pending.pop(address)}, {address: self._futures.pop(address)})
+            )
+
+        future = self._hass.loop.create_future()
+        self._pending[address] = words
+        self._futures.setdefault(address, []).append(future)
+        self.requested += 1
+
+        if self._timer is None:
+            self._timer = self._hass.loop.call_later(self._delay, self._start_flush)
+        return future
+
+    @callback
+    def _start_flush(self) -> None:
+        self._timer = None
+        self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Send all pending writes now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        futures, self._futures = self._futures, {}
+        await self._async_send(pending, futures)
+
+    async def _async_send(self, pending: dict[int, list[int]], futures: dict[int, list[asyncio.Future]]) -> None:
+        for address, words in merge_writes(pending):
+            block_futures = [
+                future
+                for field_address in pending
+                if address <= field_address < address + len(words)
+                for future in futures.get(field_address, ())
+            ]
+            try:
+                await self._write_block(address, words)
+                self.sent += 1
+            except Exception as e:  # noqa: BLE001
+                _LOGGER.debug("Writing registers %s..%s failed: %s", address, address + len(words) - 1, e)
+                for future in block_futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for future in block_futures:
+                if not future.done():
+                    future.set_result(None)
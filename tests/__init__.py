@@ -0,0 +1 @@
+"""Tests of the Kostal Plenticore Modbus integration."""
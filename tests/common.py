@@ -0,0 +1,47 @@
+"""Helpers shared by the tests."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+import contextlib
+import tempfile
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity as hentity, entity_registry as er
+
+from kostal_plenticore_modubs.coordinator import InverterCoordinator
+
+from kostal_simulator import KostalSimulator
+
+
+@contextlib.asynccontextmanager
+async def async_test_hass() -> AsyncIterator[HomeAssistant]:
+    """A minimal running HomeAssistant with the registries the entities need."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config.set_time_zone("UTC")
+        hentity.async_setup(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        await hass.async_start()
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+@contextlib.asynccontextmanager
+async def async_simulated_coordinator(
+    hass: HomeAssistant, simulator: KostalSimulator | None = None, **kwargs
+) -> AsyncIterator[tuple[InverterCoordinator, KostalSimulator]]:
+    """A coordinator polling a simulated inverter, shut down afterwards."""
+    simulator = simulator or KostalSimulator(port=0)
+    await simulator.start()
+    entry = SimpleNamespace(entry_id="test", title="Inverter", data={}, options={}, unique_id="test")
+    coordinator = InverterCoordinator(hass, entry, simulator.host, port=simulator.port, **kwargs)
+    entry.runtime_data = SimpleNamespace(inverter_coordinator=coordinator)
+    try:
+        yield coordinator, simulator
+    finally:
+        await coordinator.async_shutdown()
+        await simulator.stop()
@@ -0,0 +1,58 @@
+"""Tests of the circuit breaker and the quiet probes of an unreachable inverter."""
+from __future__ import annotations
+
+import logging
+import socket
+
+from kostal_plenticore_modubs.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from kostal_plenticore_modubs.connection import KostalModbusConnection
+
+
+def test_opens_after_threshold_and_reports_each_transition_once():
+    breaker = CircuitBreaker(threshold=3, backoff_min=10, backoff_max=40, jitter=0)
+
+    assert [breaker.record_failure(0) for _ in range(3)] == [False, False, True]
+    assert breaker.state == STATE_OPEN
+    assert breaker.allow(5) == STATE_OPEN
+    assert breaker.allow(10) == STATE_HALF_OPEN
+
+    # A failed probe opens the circuit again with twice the delay, not a new transition
+    assert breaker.record_failure(10) is False
+    assert (breaker.state, breaker.retry_at) == (STATE_OPEN, 30)
+    breaker.allow(30)
+    breaker.record_failure(30)
+    breaker.allow(70)
+    breaker.record_failure(70)
+    assert breaker.retry_at == 110
+
+    assert breaker.record_success() is True
+    assert breaker.record_success() is False
+    assert (breaker.state, breaker.failures) == (STATE_CLOSED, 0)
+
+
+def test_backoff_restarts_after_recovery():
+    breaker = CircuitBreaker(threshold=1, backoff_min=10, backoff_max=600, jitter=0)
+    breaker.record_failure(0)
+    breaker.allow(10)
+    breaker.record_failure(10)
+    breaker.record_success()
+
+    assert breaker.record_failure(100) is True
+    assert breaker.retry_at == 110
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_quiet_connect_drops_pymodbus_warnings(caplog):
+    port = _closed_port()
+    caplog.set_level(logging.WARNING, logger="pymodbus")
+
+    assert not await KostalModbusConnection("127.0.0.1", port).async_ensure_connected(quiet=True)
+    assert not [record for record in caplog.records if record.name.startswith("pymodbus")]
+
+    assert not await KostalModbusConnection("127.0.0.1", port).async_ensure_connected()
+    assert [record for record in caplog.records if record.name.startswith("pymodbus")]
@@ -0,0 +1,101 @@
+"""Tests of the coordinator against the simulated inverter."""
+from __future__ import annotations
+
+import asyncio
+
+from kostal_plenticore_modubs.decoder import encode_value
+from kostal_plenticore_modubs.energy_flow import ENERGY_FLOW_REGISTERS, PV_REGISTERS
+from kostal_plenticore_modubs.sensor import REGISTERS, KostalFloat32Sensor
+
+from kostal_simulator import KostalSimulator, PlenticoreScenario, SimulatedInverter
+
+from .common import async_simulated_coordinator, async_test_hass
+
+MINIMUM_SOC = 1042
+GRID_POWER = 252
+PHASE_1_POWER = 156
+
+
+async def test_read_back_leaves_the_state_of_the_poll_alone():
+    async with async_test_hass() as hass, async_simulated_coordinator(hass, sample_window=0) as (coordinator, _):
+        coordinator.async_add_register_span(MINIMUM_SOC, 2, datatype="Float")
+        coordinator.async_add_sampled_register(GRID_POWER, 2, "Float")
+        await coordinator.async_refresh()
+        assert coordinator.is_updated(GRID_POWER, 2)
+        assert coordinator.is_window_closed(GRID_POWER)
+
+        coordinator._async_patch_registers(MINIMUM_SOC, encode_value(42.0, "Float"))
+
+        assert coordinator.value(MINIMUM_SOC) == 42.0
+        assert coordinator.is_updated(GRID_POWER, 2)
+        assert coordinator.is_window_closed(GRID_POWER)
+
+
+async def test_write_interleaved_with_a_poll():
+    simulator = KostalSimulator(port=0, latency=0.02)
+    async with async_test_hass() as hass, async_simulated_coordinator(hass, simulator, sample_window=0) as (coordinator, _):
+        read_backs = []
+        published = []
+        coordinator.async_add_register_span(MINIMUM_SOC, 2, datatype="Float", read_back_callback=lambda: read_backs.append(coordinator.value(MINIMUM_SOC)))
+        coordinator.async_add_sampled_register(GRID_POWER, 2, "Float")
+        coordinator.async_add_listener(
+            lambda: published.append((coordinator.is_updated(MINIMUM_SOC, 2), coordinator.is_updated(GRID_POWER, 2), coordinator.is_window_closed(GRID_POWER)))
+        )
+
+        poll = asyncio.create_task(coordinator.async_refresh())
+        while not coordinator._modbus_lock.locked():
+            await asyncio.sleep(0)
+        written = coordinator.async_queue_write(MINIMUM_SOC, encode_value(42.0, "Float"))
+        await asyncio.gather(poll, coordinator._write_queue.async_flush())
+        await written
+
+        # The poll published everything it read, the read-back came after it and was not overwritten
+        assert published == [(True, True, True)]
+        assert read_backs == [42.0]
+        assert coordinator.value(MINIMUM_SOC) == 42.0
+
+
+async def test_energy_flow_without_the_shed_pv_registers_at_night():
+    simulator = KostalSimulator(port=0, devices={71: SimulatedInverter(PlenticoreScenario(start_hour=0.0))})
+    async with async_test_hass() as hass, async_simulated_coordinator(hass, simulator) as (coordinator, _):
+        for address in ENERGY_FLOW_REGISTERS:
+            coordinator.async_add_register_span(address, 2, datatype="Float", shed_when_idle=address in PV_REGISTERS)
+        await coordinator.async_refresh()
+        assert coordinator.idle
+
+        coordinator._last_polled.clear()
+        coordinator._energy_flow = {}
+        await coordinator.async_refresh()
+
+        polled = {span for spans in coordinator._polled_spans().values() for span in spans}
+        assert not polled & {(address, 2) for address in PV_REGISTERS}
+        assert not any(coordinator.is_updated(address, 2) for address in PV_REGISTERS)
+        assert coordinator.energy_flow["pv_to_home"] == 0.0
+        assert coordinator.energy_flow["house_load"] > 0
+
+
+async def test_shed_sampled_register_is_unknown_while_idle():
+    scenario = PlenticoreScenario(start_hour=12.0)
+    simulator = KostalSimulator(port=0, devices={71: SimulatedInverter(scenario)})
+    async with async_test_hass() as hass, async_simulated_coordinator(hass, simulator, sample_window=0) as (coordinator, _):
+        ri = next(ri for ri in REGISTERS if ri.address == PHASE_1_POWER)
+        assert ri.sampled and ri.shed_when_idle
+        sensor = KostalFloat32Sensor(
+            coordinator, "192.168.1.2", ri.address, ri.unique_id, ri.name, ri.icon, ri.device_class, ri.unit, ri.display_precision,
+            ri.sensor_state_class, ri.poll_tier, ri.deadband, ri.relative_deadband, ri.max_age, ri.shed_when_idle, True,
+        )
+        coordinator.async_add_sampled_register(PHASE_1_POWER, 2, "Float", shed_when_idle=True)
+        await coordinator.async_refresh()
+        assert not coordinator.idle
+        assert sensor.state == coordinator.window(PHASE_1_POWER)["mean"] > 0
+
+        scenario.start_hour = 0.0
+        coordinator._last_polled.clear()
+        await coordinator.async_refresh()
+
+        # Closed empty so the sensor writes once more, then stays unknown
+        assert coordinator.idle
+        assert coordinator.is_window_closed(PHASE_1_POWER)
+        assert coordinator.window(PHASE_1_POWER) is None
+        assert sensor.state is None
+        assert sensor.extra_state_attributes is None
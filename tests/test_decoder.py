@@ -0,0 +1,59 @@
+"""Tests of the block decoders and the write encoding."""
+from __future__ import annotations
+
+from array import array
+import math
+
+import pytest
+
+from kostal_plenticore_modubs.const import BYTE_ORDER_BIG, BYTE_ORDER_LITTLE
+from kostal_plenticore_modubs.decoder import BlockDecoder, compile_decoders, encode_value
+
+from kostal_simulator import encode_value as simulator_encode_value
+
+VALUES = [
+    ("Bool", 1, True),
+    ("U16", 1, 65535),
+    ("S16", 1, -1234),
+    ("U32", 2, 4_000_000_000),
+    ("S32", 2, -2_000_000_000),
+    ("Float", 2, 1234.5),
+]
+
+
+@pytest.mark.parametrize("byte_order", [BYTE_ORDER_LITTLE, BYTE_ORDER_BIG])
+@pytest.mark.parametrize(("datatype", "count", "value"), VALUES)
+def test_encode_decode_round_trip(byte_order, datatype, count, value):
+    words = encode_value(value, datatype, byte_order)
+    assert len(words) == count
+    decoder = BlockDecoder(10, count, [(10, count, datatype)], byte_order)
+    assert decoder.decode(words) == {10: value}
+
+
+@pytest.mark.parametrize("byte_order", [BYTE_ORDER_LITTLE, BYTE_ORDER_BIG])
+def test_decodes_the_word_order_of_the_inverter(byte_order):
+    words = simulator_encode_value(230.25, "Float", 2, byte_order)
+    assert BlockDecoder(0, 2, [(0, 2, "Float")], byte_order).decode(words) == {0: 230.25}
+
+
+def test_block_with_gaps_strings_and_memoryview():
+    fields = [(100, 2, "Float"), (104, 1, "U16"), (106, 4, "String")]
+    words = encode_value(-3.5, "Float") + [0, 0] + [7, 0] + [0x4142, 0x4344, 0x4500, 0]
+    decoder = BlockDecoder(100, 10, fields)
+    expected = {100: -3.5, 104: 7, 106: "ABCDE"}
+    assert decoder.decode(words) == expected
+    assert decoder.decode(memoryview(array("H", words))) == expected
+
+
+def test_fields_overlapping_or_leaving_the_block_are_skipped():
+    fields = [(0, 2, "U32"), (1, 1, "U16"), (3, 2, "Float"), (2, 1, "Unknown")]
+    decoder = BlockDecoder(0, 4, fields)
+    assert decoder.decode(encode_value(70000, "U32") + [1, 2]) == {0: 70000}
+
+
+def test_compile_decoders_assigns_fields_to_their_block():
+    fields = [(0, 2, "Float"), (10, 2, "Float"), (12, 1, "S16")]
+    first, second = compile_decoders([(0, 2), (10, 3)], fields)
+    assert first.decode(encode_value(1.0, "Float")) == {0: 1.0}
+    values = second.decode(encode_value(math.inf, "Float") + [65535])
+    assert values == {10: math.inf, 12: -1}
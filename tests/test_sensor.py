@@ -0,0 +1,34 @@
+"""Tests of the sensor entities built from the register catalog."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from homeassistant.helpers.entity import EntityCategory
+
+from kostal_plenticore_modubs.catalog import CATALOG
+from kostal_plenticore_modubs.sensor import REGISTERS, catalog_sensor
+
+COORDINATOR = SimpleNamespace()
+
+
+def test_catalog_sensors_take_the_documented_register_count():
+    sensor = catalog_sensor(COORDINATOR, "192.168.1.2", CATALOG[36])
+    assert (sensor._register_count, sensor._datatype) == (2, "U16")
+    assert sensor.entity_registry_enabled_default is False
+    assert sensor.entity_category is None
+    assert sensor.unique_id == "register_36_192_168_1_2"
+
+
+def test_catalog_string_sensors_are_diagnostic():
+    register = next(register for register in CATALOG if register.datatype == "String")
+    sensor = catalog_sensor(COORDINATOR, "192.168.1.2", register)
+    assert sensor._register_count == register.count
+    assert sensor.entity_registry_enabled_default is False
+    assert sensor.entity_category is EntityCategory.DIAGNOSTIC
+
+
+def test_catalog_sensors_match_the_catalog():
+    known = {ri.address for ri in REGISTERS}
+    for register in CATALOG:
+        if register.readable and register.address not in known:
+            assert catalog_sensor(COORDINATOR, "192.168.1.2", register)._register_count == register.count
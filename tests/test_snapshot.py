@@ -0,0 +1,81 @@
+"""Tests of the register snapshot restored at startup."""
+from __future__ import annotations
+
+import socket
+from types import SimpleNamespace
+
+from kostal_plenticore_modubs.const import RESTORE_GRACE_PERIOD
+from kostal_plenticore_modubs.coordinator import InverterCoordinator
+
+from .common import async_simulated_coordinator, async_test_hass
+
+MINIMUM_SOC = 1042
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _async_restored_coordinator(hass) -> InverterCoordinator:
+    """A coordinator of an unreachable inverter showing the snapshot of the last run."""
+    entry = SimpleNamespace(entry_id="test", title="Inverter", data={}, options={}, unique_id="test")
+    coordinator = InverterCoordinator(hass, entry, "127.0.0.1", port=_closed_port())
+    assert await coordinator.async_load_snapshot()
+    coordinator.async_add_register_span(MINIMUM_SOC, 2, datatype="Float")
+    coordinator.async_apply_snapshot()
+    return coordinator
+
+
+async def _async_save_snapshot(hass) -> float:
+    """Poll the simulator once and save the snapshot, returns the minimum SOC read."""
+    async with async_simulated_coordinator(hass) as (coordinator, _):
+        coordinator.async_add_register_span(MINIMUM_SOC, 2, datatype="Float")
+        await coordinator.async_refresh()
+        return coordinator.value(MINIMUM_SOC)
+
+
+async def test_restored_values_survive_failed_polls_until_the_circuit_opens():
+    async with async_test_hass() as hass:
+        minimum_soc = await _async_save_snapshot(hass)
+        coordinator = await _async_restored_coordinator(hass)
+        assert coordinator.restored
+        assert coordinator.value(MINIMUM_SOC) == minimum_soc
+
+        for _ in range(2):
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+            assert coordinator.restored
+            assert coordinator.value(MINIMUM_SOC) == minimum_soc
+
+        # The third failure opens the circuit
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        await coordinator.async_shutdown()
+
+
+async def test_restored_values_expire_after_the_grace_period():
+    async with async_test_hass() as hass:
+        await _async_save_snapshot(hass)
+        coordinator = await _async_restored_coordinator(hass)
+        coordinator._restored_at -= RESTORE_GRACE_PERIOD
+
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        await coordinator.async_shutdown()
+
+
+async def test_first_poll_after_restore_replaces_the_snapshot():
+    async with async_test_hass() as hass:
+        await _async_save_snapshot(hass)
+        async with async_simulated_coordinator(hass) as (coordinator, simulator):
+            assert await coordinator.async_load_snapshot()
+            coordinator.async_add_register_span(MINIMUM_SOC, 2, datatype="Float")
+            coordinator.async_apply_snapshot()
+            simulator.devices[71].set_value(MINIMUM_SOC, 33.0)
+            assert coordinator.restored
+
+            await coordinator.async_refresh()
+            assert not coordinator.restored
+            assert coordinator.value(MINIMUM_SOC) == 33.0
@@ -0,0 +1,65 @@
+"""Tests of the debounced, merged register writes."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from kostal_plenticore_modubs.write_queue import WriteQueue, merge_writes
+
+from .common import async_test_hass
+
+
+def test_merge_writes_joins_adjacent_registers():
+    writes = {1044: [3, 4], 1042: [1, 2], 1050: [5], 1046: [6]}
+    assert merge_writes(writes) == [(1042, [1, 2, 3, 4, 6]), (1050, [5])]
+
+
+async def test_writes_in_one_window_are_merged_and_the_newest_wins():
+    async with async_test_hass() as hass:
+        blocks = []
+
+        async def write_block(address, words):
+            blocks.append((address, words))
+
+        queue = WriteQueue(hass, write_block, delay=0.01)
+        futures = [
+            queue.async_write(1042, [1, 1]),
+            queue.async_write(1044, [2, 2]),
+            queue.async_write(1042, [3, 3]),
+            queue.async_write(1100, [4, 4]),
+        ]
+        await asyncio.gather(*futures)
+
+        assert blocks == [(1042, [3, 3, 2, 2]), (1100, [4, 4])]
+        assert (queue.requested, queue.sent) == (4, 2)
+
+
+async def test_a_failed_block_fails_only_its_own_futures():
+    async with async_test_hass() as hass:
+
+        async def write_block(address, words):
+            if address == 1100:
+                raise OSError("unreachable")
+
+        queue = WriteQueue(hass, write_block, delay=0.01)
+        ok = queue.async_write(1042, [1, 1])
+        failed = queue.async_write(1100, [2, 2])
+        await queue.async_flush()
+
+        assert ok.result() is None
+        with pytest.raises(OSError):
+            failed.result()
+
+
+async def test_a_different_width_at_the_same_address_sends_the_old_value_first():
+    async with async_test_hass() as hass:
+        blocks = []
+
+        async def write_block(address, words):
+            blocks.append((address, words))
+
+        queue = WriteQueue(hass, write_block, delay=0.01)
+        await asyncio.gather(queue.async_write(1042, [1]), queue.async_write(1042, [2, 3]))
+
+        assert blocks == [(1042, [1]), (1042, [2, 3])]
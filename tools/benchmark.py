@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+"""End-to-end poll-cycle benchmark.
+
+Runs InverterCoordinator._async_update_data together with the sensor and
+number platforms of the integration in a bare Home Assistant instance
+against tools/kostal_simulator.py, and reports per scenario (read plan x
+connection strategy):
+
+    registers  registers read per cycle, the same for every strategy of a plan
+    cycle      wall time of a poll cycle (read, decode, entity dispatch)
+    poll       _async_update_data alone
+    rtt        round-trip time of the block reads
+    decode     BlockDecoder.decode
+    dispatch   async_update_listeners, i.e. the entities' state writes
+    allocations peak and retained memory of a cycle (separate tracemalloc pass)
+
+Needs Home Assistant and pymodbus like the integration itself:
+
+    python tools/benchmark.py --latency 0.02 --cycles 50 --output bench.json
+
+The identity and byte order probes are read once before the measurement,
+not in the timed cycles. The result is JSON so runs can be compared,
+times are in milliseconds.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import importlib.util
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "custom_components"))
+
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry as dr, entity as hentity, entity_registry as er  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from kostal_plenticore_modubs import number, sensor  # noqa: E402
+from kostal_plenticore_modubs.connection import KostalModbusConnection  # noqa: E402
+from kostal_plenticore_modubs.const import CONF_IP_ADDRESS, DOMAIN  # noqa: E402
+from kostal_plenticore_modubs.coordinator import InverterCoordinator  # noqa: E402
+from kostal_plenticore_modubs.decoder import BlockDecoder, compile_decoders  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("kostal_simulator", Path(__file__).with_name("kostal_simulator.py"))
+kostal_simulator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(kostal_simulator)
+
+# Read plan of the integration before the plan was generated from the entities
+LEGACY_READ_BLOCKS = [(56, 2), (98, 22), (144, 2), (156, 18), (194, 94), (320, 8), (512, 18), (1042, 38)]
+# Pause after every block read of the legacy poll loop
+LEGACY_READ_DELAY = 0.05
+
+# legacy: LEGACY_READ_BLOCKS, gapN: read plan generated with max_gap N
+PLANS = ["legacy", "gap0", "gap8", "gap16", "gap32"]
+# reconnect: new connection per cycle and LEGACY_READ_DELAY after each read (the old poll loop),
+# persistent: one connection, serial reads, pipelined: one connection, concurrent reads
+STRATEGIES = ["reconnect", "persistent", "pipelined"]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Statistics of samples in seconds, as milliseconds."""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean": round(1000 * statistics.fmean(ordered), 3),
+        "median": round(1000 * statistics.median(ordered), 3),
+        "p95": round(1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "min": round(1000 * ordered[0], 3),
+        "max": round(1000 * ordered[-1], 3),
+    }
+
+
+class Probe:
+    """Timing hooks around the connection and the block decoders."""
+
+    def __init__(self, connection: KostalModbusConnection, read_delay: float = 0.0):
+        self.rtt: list[float] = []
+        self.decode = 0.0
+        self.registers = 0
+        self._read_delay = read_delay
+        self._read = connection.async_read_holding_registers
+        self._decode = BlockDecoder.decode
+        connection.async_read_holding_registers = self._timed_read
+
+    async def _timed_read(self, address: int, count: int, device_id: int | None = None) -> list[int]:
+        started = time.perf_counter()
+        try:
+            return await self._read(address, count, device_id)
+        finally:
+            self.rtt.append(time.perf_counter() - started)
+            self.registers += count
+            if self._read_delay:
+                await asyncio.sleep(self._read_delay)
+
+    def install(self) -> None:
+        probe = self
+        original = self._decode
+
+        def decode(decoder, words):
+            started = time.perf_counter()
+            try:
+                return original(decoder, words)
+            finally:
+                probe.decode += time.perf_counter() - started
+
+        BlockDecoder.decode = decode
+
+    def remove(self) -> None:
+        BlockDecoder.decode = self._decode
+
+
+async def setup_hass() -> HomeAssistant:
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.set_time_zone("UTC")
+    hentity.async_setup(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    return hass
+
+
+async def add_platforms(hass: HomeAssistant, entry) -> list[EntityPlatform]:
+    """Add the sensor and number entities of the integration."""
+    platforms = []
+    for module, domain in ((sensor, "sensor"), (number, "number")):
+        entity_platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(module.__name__),
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        entities = []
+        await module.async_setup_entry(hass, entry, entities.extend)
+        await entity_platform.async_add_entities(entities)
+        platforms.append(entity_platform)
+    return platforms
+
+
+async def run_scenario(hass: HomeAssistant, port: int, plan_name: str, strategy: str, args, index: int) -> dict:
+    entry = SimpleNamespace(
+        entry_id=f"benchmark_{index}",
+        unique_id=f"benchmark_{index}",
+        title=f"{plan_name}/{strategy}",
+        data={CONF_IP_ADDRESS: "127.0.0.1"},
+        options={},
+    )
+    coordinator = InverterCoordinator(
+        hass, entry, "127.0.0.1", pipelined=strategy == "pipelined", max_in_flight=args.max_in_flight, port=port
+    )
+    entry.runtime_data = SimpleNamespace(inverter_coordinator=coordinator)
+    platforms = await add_platforms(hass, entry)
+    entities = sum(len(entity_platform.entities) for entity_platform in platforms)
+
+    if plan_name == "legacy":
+        legacy_plan = compile_decoders(LEGACY_READ_BLOCKS, coordinator._fields)
+        coordinator._plan_for = lambda tiers: legacy_plan
+        coordinator._registers.layout(LEGACY_READ_BLOCKS)
+        coordinator._layout_dirty = False
+    else:
+        coordinator.max_gap = int(plan_name[3:])
+    plan = coordinator.read_plan if plan_name != "legacy" else list(LEGACY_READ_BLOCKS)
+    spans = {span for spans in coordinator._tier_spans.values() for span in spans}
+    uncovered = sorted(
+        span for span in spans
+        if not any(start <= span[0] and span[0] + span[1] <= start + count for start, count in plan)
+    )
+
+    state_writes = 0
+
+    def count_state_write(event) -> None:
+        nonlocal state_writes
+        if event.data.get("new_state") is not None:
+            state_writes += 1
+
+    unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write)
+    probe = Probe(coordinator.connection, LEGACY_READ_DELAY if strategy == "reconnect" else 0.0)
+
+    async def cycle() -> tuple[float, float]:
+        # Every tier is read in every cycle so plans are compared on the same registers
+        coordinator._last_polled.clear()
+        started = time.perf_counter()
+        coordinator.data = await coordinator._async_update_data()
+        polled = time.perf_counter()
+        coordinator.async_update_listeners()
+        dispatched = time.perf_counter()
+        if strategy == "reconnect":
+            await coordinator.connection.async_close()
+        return polled - started, dispatched - polled
+
+    # The identity and the byte order are one-off probes, read again after every reconnect.
+    # Read them before the measurement only, so every strategy times the same plan.
+    await cycle()
+
+    async def skip_identity() -> None:
+        pass
+
+    coordinator._async_read_identity = skip_identity
+
+    for _ in range(args.warmup):
+        await cycle()
+        await asyncio.sleep(0)
+
+    probe.rtt.clear()
+    probe.registers = 0
+    state_writes = 0
+    connects = coordinator.connection.connects
+    cycles, polls, dispatches = [], [], []
+    probe.install()
+    try:
+        for _ in range(args.cycles):
+            poll, dispatch = await cycle()
+            polls.append(poll)
+            dispatches.append(dispatch)
+            cycles.append(poll + dispatch)
+            await asyncio.sleep(0)
+        decode = probe.decode
+    finally:
+        probe.remove()
+    rtt = list(probe.rtt)
+    registers = probe.registers
+    writes = state_writes
+    connects = coordinator.connection.connects - connects
+
+    tracemalloc.start()
+    peaks, retained = [], []
+    for _ in range(args.alloc_cycles):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await cycle()
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained.append(current - before)
+        await asyncio.sleep(0)
+    tracemalloc.stop()
+
+    unsubscribe()
+    for entity_platform in platforms:
+        await entity_platform.async_reset()
+    await coordinator.async_shutdown()
+
+    return {
+        "plan": plan_name,
+        "strategy": strategy,
+        "blocks": [list(block) for block in plan],
+        "uncovered_spans": [list(span) for span in uncovered],
+        "entities": entities,
+        "connects": connects,
+        "registers_per_cycle": registers // max(args.cycles, 1),
+        "cycle": summarize(cycles),
+        "poll": summarize(polls),
+        "rtt": summarize(rtt),
+        "decode_per_cycle": round(1000 * decode / max(args.cycles, 1), 4),
+        "dispatch": summarize(dispatches),
+        "state_writes_per_cycle": round(writes / max(args.cycles, 1), 2),
+        "allocations": {
+            "peak_bytes": max(peaks, default=0),
+            "retained_bytes": round(statistics.fmean(retained)) if retained else 0,
+        },
+    }
+
+
+async def run(args) -> dict:
+    hass = await setup_hass()
+    simulator = kostal_simulator.KostalSimulator(port=0, latency=args.latency, jitter=args.jitter, seed=args.seed)
+    results = []
+    try:
+        async with simulator:
+            for plan_name in args.plans:
+                for strategy in args.strategies:
+                    result = await run_scenario(hass, simulator.port, plan_name, strategy, args, len(results))
+                    logging.getLogger("benchmark").info(
+                        "%s/%s: cycle %.1f ms, %s registers",
+                        plan_name, strategy, result["cycle"].get("median", 0), result["registers_per_cycle"],
+                    )
+                    results.append(result)
+    finally:
+        await hass.async_stop(force=True)
+
+    return {
+        "python": platform.python_version(),
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "cycles": args.cycles,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random delay in seconds")
+    parser.add_argument("--cycles", type=int, default=20, help="measured poll cycles per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured cycles before the measurement")
+    parser.add_argument("--alloc-cycles", type=int, default=3, help="cycles traced for allocations")
+    parser.add_argument("--plans", nargs="+", choices=PLANS, default=PLANS)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--max-in-flight", type=int, default=4, help="pipelined requests in flight")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON result to this file instead of stdout")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    logging.getLogger("benchmark").setLevel(logging.INFO)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python
+"""Kostal Plenticore Modbus TCP simulator.
+
+Serves the register map of KOSTAL_Register.py with the inverter's
+datatypes and word order, so the integration can be exercised and
+benchmarked without an inverter:
+
+    python tools/kostal_simulator.py --port 1502 --latency 0.03
+
+Values come from a scenario (diurnal PV curve, home load, battery cycling,
+grid exchange) evaluated on a clock that can be injected for deterministic
+runs. Latency, jitter, dropped responses, exception responses and the number
+of accepted connections are configurable. Several unit ids can be served
+behind one endpoint, like a Modbus TCP gateway.
+
+Used as a library:
+
+    async with KostalSimulator(port=0, latency=0.02) as sim:
+        ... connect to 127.0.0.1:sim.port, unit id 71 ...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import importlib.util
+import logging
+import math
+from pathlib import Path
+import random
+import struct
+import time
+
+_LOGGER = logging.getLogger("kostal_simulator")
+
+REGISTER_FILE = Path(__file__).resolve().parents[1] / "custom_components" / "kostal_plenticore_modubs" / "KOSTAL_Register.py"
+
+DEFAULT_UNIT_ID = 71
+
+# Register 5 ("MODBUS Byte Order"): 0 = little endian (CDAB), 1 = big endian (ABCD)
+BYTE_ORDER_LITTLE = 0
+BYTE_ORDER_BIG = 1
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+SERVER_DEVICE_BUSY = 6
+GATEWAY_TARGET_FAILED = 11
+
+
+def load_register_map() -> dict[int, dict]:
+    """Load KOSTAL_MODBUS_REGISTERS without importing the integration package."""
+    spec = importlib.util.spec_from_file_location("KOSTAL_Register", REGISTER_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.KOSTAL_MODBUS_REGISTERS
+
+
+def encode_value(value, datatype: str, count: int, byte_order: int = BYTE_ORDER_LITTLE) -> list[int]:
+    """Encode a value into register words like the inverter does."""
+    if datatype == "String":
+        data = str(value).encode("ascii")[: 2 * count].ljust(2 * count, b"\0")
+        return list(struct.unpack(f">{count}H", data))
+    if datatype in ("Float", "U32", "S32"):
+        code = {"Float": ">f", "U32": ">I", "S32": ">i"}[datatype]
+        high, low = struct.unpack(">2H", struct.pack(code, value))
+        return [high, low] if byte_order == BYTE_ORDER_BIG else [low, high]
+    return [int(value) & 0xFFFF]
+
+
+# Static values of an inverter that never change
+IDENTITY = {
+    2: 1,                       # MODBUS Enable
+    4: DEFAULT_UNIT_ID,         # MODBUS Unit-ID
+    6: "10534426",              # article number
+    14: "91234ABC0042",         # serial number
+    30: 1,                      # bidirectional converter
+    32: 3,                      # AC phases
+    34: 3,                      # PV strings
+    36: 0x0101,                 # hardware version
+    38: "01.49",                # MC software
+    46: "01.45",                # IOC software
+    54: 0x00010002,             # power id
+    58: "01.26.09454",          # overall software version
+    512: 10240,                 # battery gross capacity
+    517: "BYD",
+    525: 1,
+    527: 123456,
+    529: 9800,
+    531: 10000,
+    768: "PLENTICORE plus",
+    800: "10",
+    1025: 0,                    # power scale factor
+    1042: 5.0,                  # minimum SOC
+    1044: 100.0,                # maximum SOC
+    1068: 9800.0,               # battery work capacity
+    1070: 123456,
+    1076: 6000.0,
+    1078: 6000.0,
+}
+
+
+class PlenticoreScenario:
+    """Deterministic day of a PV system with battery.
+
+    PV follows a sine between sunrise and sunset, the home load and the grid
+    swing with fixed periods and seeded noise, and the battery absorbs the
+    difference within its power and SOC limits. Energy counters integrate
+    the powers between evaluations.
+    """
+
+    def __init__(
+        self,
+        pv_peak: float = 9000.0,
+        base_load: float = 450.0,
+        battery_capacity: float = 9800.0,
+        battery_power: float = 5000.0,
+        start_hour: float = 12.0,
+        time_scale: float = 1.0,
+        seed: int = 0,
+    ):
+        self.pv_peak = pv_peak
+        self.base_load = base_load
+        self.battery_capacity = battery_capacity
+        self.battery_power = battery_power
+        self.start_hour = start_hour
+        self.time_scale = time_scale
+        self._random = random.Random(seed)
+        self._soc = 50.0
+        self._energy = {
+            "yield": 2_500_000.0, "daily": 0.0, "monthly": 250_000.0, "yearly": 1_500_000.0,
+            "home_pv": 900_000.0, "home_battery": 400_000.0, "home_grid": 700_000.0,
+            "to_grid": 1_300_000.0, "dc_to_battery": 600_000.0, "dc_from_battery": 550_000.0,
+            "pv": 2_700_000.0, "pv1": 1_000_000.0, "pv2": 1_000_000.0, "pv3": 700_000.0,
+        }
+        self._last_t: float | None = None
+        self._worktime = 30_000_000.0
+
+    def pv_power(self, hour: float) -> float:
+        return max(0.0, self.pv_peak * math.sin(math.pi * (hour - 6.0) / 14.0)) if 6.0 <= hour <= 20.0 else 0.0
+
+    def __call__(self, t: float) -> dict[int, float | int]:
+        """Register values at t seconds after the start."""
+        t *= self.time_scale
+        dt = 0.0 if self._last_t is None else max(0.0, t - self._last_t)
+        self._last_t = t
+        hour = (self.start_hour + t / 3600.0) % 24.0
+
+        noise = self._random.uniform(-1.0, 1.0)
+        pv = self.pv_power(hour) * (0.95 + 0.05 * noise)
+        load = self.base_load + 300.0 * math.sin(t / 600.0) ** 2 + 1500.0 * max(0.0, math.sin(t / 97.0)) ** 8 + 20.0 * noise
+
+        surplus = pv - load
+        charge = max(-self.battery_power, min(self.battery_power, surplus))
+        if (charge > 0 and self._soc >= 100.0) or (charge < 0 and self._soc <= 5.0):
+            charge = 0.0
+        self._soc = min(100.0, max(5.0, self._soc + charge * dt / 3600.0 / self.battery_capacity * 100.0))
+        grid = load - pv + charge  # > 0: import
+
+        home_pv = min(load, pv)
+        home_battery = min(load - home_pv, max(0.0, -charge))
+        home_grid = max(0.0, load - home_pv - home_battery)
+
+        def integrate(key, power):
+            self._energy[key] += max(0.0, power) * dt / 3600.0
+
+        ac_power = pv - max(0.0, charge) + max(0.0, -charge)
+        for key, power in (
+            ("yield", ac_power), ("daily", ac_power), ("monthly", ac_power), ("yearly", ac_power),
+            ("home_pv", home_pv), ("home_battery", home_battery), ("home_grid", home_grid),
+            ("to_grid", -grid), ("dc_to_battery", charge), ("dc_from_battery", -charge),
+            ("pv", pv), ("pv1", pv * 0.4), ("pv2", pv * 0.4), ("pv3", pv * 0.2),
+        ):
+            integrate(key, power)
+        if pv > 0:
+            self._worktime += dt
+
+        battery_voltage = 400.0 + 0.5 * self._soc
+        dc_voltage = 550.0 if pv > 0 else 0.0
+        phase = ac_power / 3.0
+        meter_phase = grid / 3.0
+        e = self._energy
+
+        return {
+            56: 6 if pv > 0 else 10,        # FeedIn / Standby
+            98: 40.0 + pv / 500.0,
+            100: pv,
+            104: 1 if pv > 0 else 0,
+            106: home_battery,
+            108: home_grid,
+            110: e["home_battery"],
+            112: e["home_grid"],
+            114: e["home_pv"],
+            116: home_pv,
+            118: e["home_battery"] + e["home_grid"] + e["home_pv"],
+            120: 5_000_000.0,
+            124: load,
+            144: self._worktime,
+            150: 1.0,
+            152: 50.0 + 0.02 * noise,
+            154: phase / 230.0, 156: phase, 158: 230.0 + noise,
+            160: phase / 230.0, 162: phase, 164: 231.0 + noise,
+            166: phase / 230.0, 168: phase, 170: 229.0 + noise,
+            172: ac_power,
+            178: abs(ac_power),
+            190: charge / battery_voltage,
+            194: 350.0 + e["dc_to_battery"] / self.battery_capacity,
+            200: -charge / battery_voltage,
+            208: 1.0,
+            210: self._soc,
+            214: 24.0 + abs(charge) / 1000.0,
+            216: battery_voltage,
+            218: 0.98,
+            220: 50.0,
+            222: meter_phase / 230.0, 224: meter_phase, 230: 230.0,
+            232: meter_phase / 230.0, 234: meter_phase, 240: 231.0,
+            242: meter_phase / 230.0, 244: meter_phase, 250: 229.0,
+            252: grid,
+            256: abs(grid),
+            258: pv * 0.4 / dc_voltage if dc_voltage else 0.0, 260: pv * 0.4, 266: dc_voltage,
+            268: pv * 0.4 / dc_voltage if dc_voltage else 0.0, 270: pv * 0.4, 276: dc_voltage,
+            278: pv * 0.2 / dc_voltage if dc_voltage else 0.0, 280: pv * 0.2, 286: dc_voltage,
+            320: e["yield"], 322: e["daily"], 324: e["yearly"], 326: e["monthly"],
+            514: round(self._soc),
+            575: int(ac_power),
+            582: int(-charge),
+            1046: e["dc_to_battery"], 1048: e["dc_from_battery"],
+            1050: e["dc_to_battery"] * 0.9, 1052: 0.0, 1054: e["dc_to_battery"] * 0.05,
+            1056: e["pv"], 1058: e["pv1"], 1060: e["pv2"], 1062: e["pv3"],
+            1064: e["to_grid"],
+            1066: pv,
+        }
+
+
+class SimulatedInverter:
+    """Register model of one inverter (one unit id)."""
+
+    def __init__(
+        self,
+        scenario: Callable[[float], dict[int, float | int]] | None = None,
+        byte_order: int = BYTE_ORDER_LITTLE,
+        strict: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            scenario: returns {address: value} for the seconds since start
+            byte_order: value of register 5, word order of 32 bit values
+            strict: answer reads of undocumented registers with ILLEGAL_DATA_ADDRESS
+            clock: time source of the scenario
+        """
+        self.registers = load_register_map()
+        self.byte_order = byte_order
+        self.strict = strict
+        self._scenario = scenario if scenario is not None else PlenticoreScenario()
+        self._clock = clock
+        self._start = clock()
+        self._scenario_at: float | None = None
+        self._words: dict[int, int] = {}
+
+        for address, value in IDENTITY.items():
+            self.set_value(address, value)
+        self.set_value(5, byte_order)
+
+    def set_value(self, address: int, value) -> None:
+        """Set a documented register to a value, encoded by its datatype."""
+        info = self.registers[address]
+        words = encode_value(value, info["datatype"] or "U16", info["registers"], self.byte_order)
+        for offset, word in enumerate(words):
+            self._words[address + offset] = word
+
+    def _update(self) -> None:
+        now = self._clock()
+        if now == self._scenario_at:
+            return
+        self._scenario_at = now
+        for address, value in self._scenario(now - self._start).items():
+            if address in self.registers:
+                self.set_value(address, value)
+
+    def _documented(self, address: int, count: int) -> bool:
+        """Whether address..address+count-1 overlaps a documented register."""
+        return any(
+            start + self.registers[start]["registers"] > address
+            for start in range(max(0, address - 31), address + count)
+            if start in self.registers
+        )
+
+    def read(self, address: int, count: int) -> list[int] | int:
+        """Words of a block, or a Modbus exception code."""
+        if not 1 <= count <= 125 or address + count > 0x10000:
+            return ILLEGAL_DATA_VALUE
+        if self.strict and not all(self._documented(a, 1) for a in range(address, address + count)):
+            return ILLEGAL_DATA_ADDRESS
+        self._update()
+        return [self._words.get(a, 0) for a in range(address, address + count)]
+
+    def write(self, address: int, words: list[int]) -> int | None:
+        """Store written words, returns a Modbus exception code on failure."""
+        for a in range(address, address + len(words)):
+            info = self.registers.get(a)
+            if info is not None and info["access"] not in ("RW", "WO"):
+                return ILLEGAL_DATA_ADDRESS
+        if not self._documented(address, len(words)):
+            return ILLEGAL_DATA_ADDRESS
+        for offset, word in enumerate(words):
+            self._words[address + offset] = word & 0xFFFF
+        if address <= 5 < address + len(words):
+            # Re-encode the scenario values in the new word order on the next read
+            self.byte_order = self._words[5]
+            self._scenario_at = None
+        return None
+
+
+class KostalSimulator:
+    """Asyncio Modbus TCP server for one or more simulated inverters."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 1502,
+        devices: dict[int, SimulatedInverter] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        exception_rate: float = 0.0,
+        exception_code: int = SERVER_DEVICE_BUSY,
+        max_connections: int | None = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            devices: simulated inverters by unit id (default: one at unit 71)
+            latency: seconds before a response is sent
+            jitter: additional uniformly distributed latency in seconds
+            drop_rate: probability that a request is never answered
+            exception_rate: probability that a request is answered with exception_code
+            max_connections: further connections are closed right away
+            seed: seed of the fault injection
+        """
+        self.host = host
+        self.port = port
+        self.devices = devices if devices is not None else {DEFAULT_UNIT_ID: SimulatedInverter()}
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.exception_rate = exception_rate
+        self.exception_code = exception_code
+        self.max_connections = max_connections
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+        self.stats = {"connections": 0, "rejected": 0, "requests": 0, "dropped": 0, "exceptions": 0}
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOGGER.info("Simulating %s unit(s) on %s:%s", len(self.devices), self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> KostalSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def disconnect_all(self) -> None:
+        """Drop every client connection, e.g. to test reconnects."""
+        for writer in list(self._connections):
+            writer.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.max_connections is not None and len(self._connections) >= self.max_connections:
+            self.stats["rejected"] += 1
+            writer.close()
+            return
+
+        self.stats["connections"] += 1
+        self._connections.add(writer)
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                tid, _pid, length, unit = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                # Requests are answered concurrently, so pipelined clients see overlapping responses
+                task = asyncio.create_task(self._answer(writer, tid, unit, pdu))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away or the server is stopping
+            pass
+        finally:
+            self._connections.discard(writer)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, writer: asyncio.StreamWriter, tid: int, unit: int, pdu: bytes) -> None:
+        self.stats["requests"] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        drop = self._random.random() < self.drop_rate
+        fail = self._random.random() < self.exception_rate
+        if delay:
+            await asyncio.sleep(delay)
+        if drop:
+            self.stats["dropped"] += 1
+            return
+
+        function = pdu[0]
+        if fail:
+            self.stats["exceptions"] += 1
+            response = bytes([function | 0x80, self.exception_code])
+        else:
+            response = self._execute(unit, pdu)
+        if writer.is_closing():
+            return
+        writer.write(struct.pack(">HHHB", tid, 0, len(response) + 1, unit) + response)
+
+    def _execute(self, unit: int, pdu: bytes) -> bytes:
+        function = pdu[0]
+        device = self.devices.get(unit)
+        if device is None:
+            return bytes([function | 0x80, GATEWAY_TARGET_FAILED])
+
+        if function == 0x03:
+            address, count = struct.unpack(">HH", pdu[1:5])
+            result = device.read(address, count)
+            if isinstance(result, int):
+                return bytes([function | 0x80, result])
+            return bytes([function, 2 * count]) + struct.pack(f">{count}H", *result)
+
+        if function == 0x06:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            if (code := device.write(address, [value])) is not None:
+                return bytes([function | 0x80, code])
+            return pdu[:5]
+
+        if function == 0x10:
+            address, count = struct.unpack(">HH", pdu[1:5])
+            words = list(struct.unpack(f">{count}H", pdu[6:6 + 2 * count]))
+            if (code := device.write(address, words)) is not None:
+                return bytes([function | 0x80, code])
+            return pdu[:5]
+
+        return bytes([function | 0x80, ILLEGAL_FUNCTION])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1502)
+    parser.add_argument("--units", type=int, nargs="+", default=[DEFAULT_UNIT_ID], help="unit ids to serve")
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="additional random delay in seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of unanswered requests")
+    parser.add_argument("--exception-rate", type=float, default=0.0, help="probability of exception responses")
+    parser.add_argument("--exception-code", type=int, default=SERVER_DEVICE_BUSY)
+    parser.add_argument("--max-connections", type=int, default=None)
+    parser.add_argument("--big-endian", action="store_true", help="use ABCD word order (register 5 = 1)")
+    parser.add_argument("--strict", action="store_true", help="reject reads of undocumented registers")
+    parser.add_argument("--start-hour", type=float, default=12.0, help="time of day the scenario starts at")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="scenario seconds per real second")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    devices = {
+        unit: SimulatedInverter(
+            PlenticoreScenario(start_hour=args.start_hour, time_scale=args.time_scale, seed=args.seed + unit),
+            byte_order=BYTE_ORDER_BIG if args.big_endian else BYTE_ORDER_LITTLE,
+            strict=args.strict,
+        )
+        for unit in args.units
+    }
+    simulator = KostalSimulator(
+        args.host,
+        args.port,
+        devices,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        exception_rate=args.exception_rate,
+        exception_code=args.exception_code,
+        max_connections=args.max_connections,
+        seed=args.seed,
+    )
+
+    async def run() -> None:
+        async with simulator:
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()